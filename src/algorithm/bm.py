@@ -1,64 +1,394 @@
-"""Boyer-Moore string matching algorithm"""
+"""Boyer-Moore string matching algorithm
 
-from typing import List, Dict
+Three variants share one interface:
+- BM: bad-character and good-suffix rules
+- HORSPOOL: bad-character shift on the last window character only
+- SUNDAY: quick search, shift on the character just past the window
+
+Shift tables are built once per pattern by compile() and reused for every text.
+compile_multiple() builds a Wu-Manber table so count_multiple() counts many byte
+patterns in one pass over the text.
+"""
+
+import pickle
+import random
+import time
+from typing import List, Dict, Optional
+
+VARIANTS = ('BM', 'HORSPOOL', 'SUNDAY')
+MAX_COMPILED = 256  # Compiled pattern cache size per matcher
+
+# Fastest variant by pattern length, as (longest length, variant) pairs.
+# Measured on the folded bytes of 60 data/ CVs, where Horspool won at every length.
+# Re-measure with benchmark_variants() or BoyerMooreMatcher.tune()
+AUTO_VARIANTS = ((None, 'HORSPOOL'),)
+
+def good_suffix_table(pattern) -> List[int]:
+    """Strong good-suffix shifts, shift[j + 1] applies after a mismatch at j"""
+    length = len(pattern)
+    shift = [0] * (length + 1)
+    border = [0] * (length + 1)
+    
+    # Case 1: the matched suffix reoccurs preceded by a different character
+    i = length
+    j = length + 1
+    border[i] = j
+    while i > 0:
+        while j <= length and pattern[i - 1] != pattern[j - 1]:
+            if shift[j] == 0:
+                shift[j] = j - i
+            j = border[j]
+        i -= 1
+        j -= 1
+        border[i] = j
+    
+    # Case 2: only a prefix of the pattern matches a suffix of the matched part
+    j = border[0]
+    for i in range(length + 1):
+        if shift[i] == 0:
+            shift[i] = j
+        if i == j:
+            j = border[j]
+    
+    return shift
+
+def char_table(entries, default: int, is_bytes: bool):
+    """Shift table indexed by character, later entries win
+    
+    Byte patterns get a 256-entry list indexed by byte value, so the inner
+    loops do no hashing. Str patterns get a plain dict of the pattern's own
+    characters, read with table.get(char, default) so it never grows and
+    stays picklable.
+    """
+    if is_bytes:
+        table = [default] * 256
+        for char, value in entries:
+            table[char] = value
+        return table
+    
+    return dict(entries)
+
+class BMPattern:
+    """Pattern with its shift tables precomputed for one variant"""
+    
+    def __init__(self, pattern, variant: str = 'BM'):
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown Boyer-Moore variant: {variant}")
+        
+        self.pattern = pattern
+        self.variant = variant
+        self.is_bytes = isinstance(pattern, (bytes, bytearray))
+        length = len(pattern)
+        
+        if variant == 'BM':
+            # Last occurrence of each character, -1 when absent
+            self.default = -1
+            self.last = char_table(((char, i) for i, char in enumerate(pattern)), self.default, self.is_bytes)
+            self.good_suffix = good_suffix_table(pattern)
+        elif variant == 'HORSPOOL':
+            # Distance from the last occurrence in pattern[:-1] to the end
+            self.default = length
+            self.shift = char_table(((char, length - 1 - i) for i, char in enumerate(pattern[:-1])),
+                                    self.default, self.is_bytes)
+        else:
+            # Distance from the last occurrence to one past the end
+            self.default = length + 1
+            self.shift = char_table(((char, length - i) for i, char in enumerate(pattern)),
+                                    self.default, self.is_bytes)
+    
+    def __len__(self):
+        return len(self.pattern)
+
+class WuManberPattern:
+    """Byte patterns scanned together with Horspool shifts on 2-byte blocks
+    
+    Windows are as long as the shortest pattern. A zero shift means the last
+    block ends some pattern prefix, which is then verified in place.
+    """
+    
+    BLOCK = 2
+    
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        # Patterns shorter than a block are counted one by one
+        self.short = [idx for idx, pattern in enumerate(self.patterns) if 0 < len(pattern) < self.BLOCK]
+        long_patterns = [(idx, pattern) for idx, pattern in enumerate(self.patterns)
+                         if len(pattern) >= self.BLOCK]
+        self.min_length = min((len(pattern) for _, pattern in long_patterns), default=0)
+        
+        window = self.min_length
+        self.shift = [window - self.BLOCK + 1] * 65536
+        self.candidates: Dict[int, List[int]] = {}
+        for idx, pattern in long_patterns:
+            # Distance from each block in the first window bytes to the window end
+            for end in range(self.BLOCK, window + 1):
+                block = (pattern[end - 2] << 8) | pattern[end - 1]
+                if window - end < self.shift[block]:
+                    self.shift[block] = window - end
+            block = (pattern[window - 2] << 8) | pattern[window - 1]
+            self.candidates.setdefault(block, []).append(idx)
+    
+    def __len__(self):
+        return len(self.patterns)
 
 class BoyerMooreMatcher:
     """Boyer-Moore string matching implementation"""
     
-    def __init__(self):
-        pass
+    def __init__(self, variant: str = 'AUTO'):
+        if variant != 'AUTO' and variant not in VARIANTS:
+            raise ValueError(f"Unknown Boyer-Moore variant: {variant}")
+        self.variant = variant
+        self.auto_variants = list(AUTO_VARIANTS)
+        self.compiled = {}
     
-    def search(self, text: str, pattern: str) -> List[int]:
-        """Search pattern in text"""
+    def choose_variant(self, length: int) -> str:
+        """Variant used for a pattern of this length"""
+        if self.variant != 'AUTO':
+            return self.variant
+        for max_length, variant in self.auto_variants:
+            if max_length is None or length <= max_length:
+                return variant
+        return 'BM'
+    
+    def compile(self, pattern, variant: Optional[str] = None) -> BMPattern:
+        """Build shift tables once, cached for later calls"""
+        variant = variant or self.choose_variant(len(pattern))
+        key = (pattern, variant)
+        compiled = self.compiled.get(key)
+        if compiled is None:
+            if len(self.compiled) >= MAX_COMPILED:
+                # Drop the oldest pattern
+                self.compiled.pop(next(iter(self.compiled)))
+            compiled = self.compiled[key] = BMPattern(pattern, variant)
+        return compiled
+    
+    def compile_multiple(self, patterns) -> WuManberPattern:
+        """Build the Wu-Manber table for a tuple of byte patterns, cached"""
+        key = ('multi', tuple(patterns))
+        compiled = self.compiled.get(key)
+        if compiled is None:
+            if len(self.compiled) >= MAX_COMPILED:
+                self.compiled.pop(next(iter(self.compiled)))
+            compiled = self.compiled[key] = WuManberPattern(patterns)
+        return compiled
+    
+    def count_multiple(self, text: bytes, compiled: WuManberPattern) -> List[int]:
+        """Occurrences of every pattern, overlaps included, in one pass over byte text"""
+        counts = [0] * len(compiled)
+        if not text:
+            return counts
+        for idx in compiled.short:
+            counts[idx] = self.count(text, compiled.patterns[idx])
+        if not compiled.min_length:
+            return counts
+        
+        patterns = compiled.patterns
+        shift_table = compiled.shift
+        candidates = compiled.candidates
+        window = compiled.min_length
+        text_length = len(text)
+        end = window - 1
+        
+        while end < text_length:
+            block = (text[end - 1] << 8) | text[end]
+            shift = shift_table[block]
+            if shift:
+                end += shift
+                continue
+            
+            start = end - window + 1
+            for idx in candidates[block]:
+                pattern = patterns[idx]
+                if text[start:start + len(pattern)] == pattern:
+                    counts[idx] += 1
+            end += 1
+        
+        return counts
+    
+    def search(self, text: str, pattern) -> List[int]:
+        """Search pattern (string or compiled BMPattern) in text"""
         if not pattern or not text:
             return []
         
-        # Build bad character table
-        bad_char = self._build_bad_character_table(pattern)
-        
-        # Search
         matches = []
+        self._scan(text, self._compiled(pattern), positions=matches)
+        return matches
+    
+    def count(self, text: str, pattern) -> int:
+        """Count occurrences without building a position list"""
+        if not pattern or not text:
+            return 0
+        return self._scan(text, self._compiled(pattern))
+    
+    def contains(self, text: str, pattern) -> bool:
+        """Check for an occurrence, stopping at the first one"""
+        if not pattern or not text:
+            return False
+        return self._scan(text, self._compiled(pattern), limit=1) > 0
+    
+    def search_multiple(self, text: str, patterns: List[str]) -> Dict[str, List[int]]:
+        """Search multiple patterns"""
+        results = {}
+        for pattern in patterns:
+            matches = self.search(text, pattern)
+            if matches:
+                results[pattern.lower()] = matches
+        return results
+    
+    def tune(self, texts: List[str], lengths=(2, 3, 4, 6, 8, 12, 16, 24), repeat: int = 3):
+        """Measure every variant on sample texts and keep the fastest per pattern length"""
+        timings = _time_variants(self, texts, lengths, repeat)
+        
+        self.auto_variants = []
+        for length in lengths:
+            best = min(VARIANTS, key=lambda variant: timings[length][variant])
+            if self.auto_variants and self.auto_variants[-1][1] == best:
+                self.auto_variants[-1] = (length, best)
+            else:
+                self.auto_variants.append((length, best))
+        # Longer patterns keep the choice made for the longest measured length
+        self.auto_variants[-1] = (None, self.auto_variants[-1][1])
+        return timings
+    
+    def _compiled(self, pattern) -> BMPattern:
+        return pattern if isinstance(pattern, BMPattern) else self.compile(pattern)
+    
+    def _scan(self, text: str, compiled: BMPattern, limit: Optional[int] = None,
+              positions: Optional[List[int]] = None) -> int:
+        """Number of matches, positions are only recorded when a list is given"""
+        if len(compiled) > len(text):
+            return 0
+        if compiled.variant == 'HORSPOOL':
+            return self._scan_horspool(text, compiled, limit, positions)
+        if compiled.variant == 'SUNDAY':
+            return self._scan_sunday(text, compiled, limit, positions)
+        return self._scan_bm(text, compiled, limit, positions)
+    
+    def _scan_bm(self, text, compiled, limit, positions) -> int:
+        """Right-to-left compare, shift by the larger of both rules"""
+        pattern = compiled.pattern
+        last = compiled.last
+        default = compiled.default
+        is_bytes = compiled.is_bytes
+        good_suffix = compiled.good_suffix
+        length = len(pattern)
+        end = len(text) - length
+        count = 0
         shift = 0
         
-        while shift <= len(text) - len(pattern):
-            j = len(pattern) - 1
+        while shift <= end:
+            j = length - 1
             
             # Compare from right to left
             while j >= 0 and pattern[j] == text[shift + j]:
                 j -= 1
             
             if j < 0:
-                # Pattern found
-                matches.append(shift)
-                # Move to next possible position
-                if shift + len(pattern) < len(text):
-                    shift += len(pattern) - bad_char.get(text[shift + len(pattern)], -1)
-                else:
-                    shift += 1
+                # Pattern found, next candidate is one period further
+                count += 1
+                if positions is not None:
+                    positions.append(shift)
+                if count == limit:
+                    break
+                shift += good_suffix[0]
             else:
-                # Mismatch, use bad character rule
-                bad_char_shift = max(1, j - bad_char.get(text[shift + j], -1))
-                shift += bad_char_shift
+                char = text[shift + j]
+                bad_char_shift = j - (last[char] if is_bytes else last.get(char, default))
+                good_suffix_shift = good_suffix[j + 1]
+                shift += good_suffix_shift if good_suffix_shift > bad_char_shift else bad_char_shift
         
-        return matches
+        return count
     
-    def search_multiple(self, text: str, patterns: List[str]) -> Dict[str, List[int]]:
-        """Search multiple patterns"""
-        results = {}
-        for pattern in patterns:
-            matches = self.search(text, pattern)
-            if matches:
-                results[pattern.lower()] = matches
-        return results
+    def _scan_horspool(self, text, compiled, limit, positions) -> int:
+        """Shift on the character under the last pattern position"""
+        pattern = compiled.pattern
+        table = compiled.shift
+        default = compiled.default
+        is_bytes = compiled.is_bytes
+        length = len(pattern)
+        last_char = pattern[-1]
+        end = len(text) - length
+        count = 0
+        shift = 0
+        
+        while shift <= end:
+            char = text[shift + length - 1]
+            if char == last_char:
+                j = length - 2
+                while j >= 0 and pattern[j] == text[shift + j]:
+                    j -= 1
+                
+                if j < 0:
+                    count += 1
+                    if positions is not None:
+                        positions.append(shift)
+                    if count == limit:
+                        break
+            shift += table[char] if is_bytes else table.get(char, default)
+        
+        return count
     
-    def _build_bad_character_table(self, pattern: str) -> Dict[str, int]:
-        """Build bad character table"""
-        bad_char = {}
+    def _scan_sunday(self, text, compiled, limit, positions) -> int:
+        """Shift on the character just past the window"""
+        pattern = compiled.pattern
+        table = compiled.shift
+        default = compiled.default
+        is_bytes = compiled.is_bytes
+        length = len(pattern)
+        text_length = len(text)
+        end = text_length - length
+        count = 0
+        shift = 0
+        
+        while shift <= end:
+            j = 0
+            while j < length and pattern[j] == text[shift + j]:
+                j += 1
+            
+            if j == length:
+                count += 1
+                if positions is not None:
+                    positions.append(shift)
+                if count == limit:
+                    break
+            
+            if shift + length >= text_length:
+                break
+            char = text[shift + length]
+            shift += table[char] if is_bytes else table.get(char, default)
         
-        for i in range(len(pattern)):
-            bad_char[pattern[i]] = i
+        return count
+
+def _time_variants(matcher: BoyerMooreMatcher, texts: List[str], lengths, repeat: int = 3):
+    """Seconds per variant and pattern length, counting patterns sampled from the texts"""
+    rng = random.Random(7)
+    texts = [text for text in texts if text]
+    timings = {}
+    
+    for length in lengths:
+        # Half the patterns occur in the texts, half are shuffled and mostly absent
+        patterns = []
+        for _ in range(8):
+            text = rng.choice(texts)
+            start = rng.randrange(max(1, len(text) - length))
+            patterns.append(text[start:start + length])
+            shuffled = rng.sample(list(patterns[-1]), len(patterns[-1]))
+            patterns.append(bytes(shuffled) if isinstance(text, bytes) else ''.join(shuffled))
+        patterns = [pattern for pattern in patterns if len(pattern) == length]
         
-        return bad_char
+        timings[length] = {}
+        for variant in VARIANTS:
+            compiled = [matcher.compile(pattern, variant) for pattern in patterns]
+            best = float('inf')
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                for text in texts:
+                    for pattern in compiled:
+                        matcher.count(text, pattern)
+                best = min(best, time.perf_counter() - start_time)
+            timings[length][variant] = best
+    
+    return timings
 
 def test_boyer_moore_consistency():
     """Test BM against naive implementation"""
@@ -89,6 +419,10 @@ def test_boyer_moore_consistency():
         bm_result = bm.search(text, pattern)
         naive_result = naive_search(text, pattern)
         
+        if bm.count(text, pattern) != len(naive_result) or bm.contains(text, pattern) != bool(naive_result):
+            print(f"❌ count/contains disagree for '{pattern}'")
+            all_passed = False
+        
         print(f"Text: '{text}'")
         print(f"Pattern: '{pattern}'")
         print(f"BM Result: {bm_result}")
@@ -102,11 +436,112 @@ def test_boyer_moore_consistency():
         
         print("-" * 40)
     
+    # Every variant on repetitive random text, str, bytes and memoryview
+    rng = random.Random(5)
+    mismatches = 0
+    for _ in range(500):
+        text = ''.join(rng.choice('ab ') for _ in range(rng.randint(0, 60)))
+        pattern = ''.join(rng.choice('ab ') for _ in range(rng.randint(1, 6)))
+        expected = naive_search(text, pattern)
+        for variant in VARIANTS:
+            compiled = bm.compile(pattern, variant)
+            encoded = bm.compile(pattern.encode(), variant)
+            if (bm.search(text, compiled) != expected or bm.search(text.encode(), encoded) != expected
+                    or bm.count(text, compiled) != len(expected)
+                    or bm.count(memoryview(text.encode()), encoded) != len(expected)):
+                mismatches += 1
+    
+    if mismatches:
+        print(f"❌ {mismatches} variant mismatches on random text")
+        all_passed = False
+    else:
+        print(f"✅ {', '.join(VARIANTS)} agree with naive search on random text")
+    
+    # Str shift tables hold only pattern characters and survive pickling for worker processes
+    restored_ok = True
+    for variant in VARIANTS:
+        compiled = bm.compile('python', variant)
+        table = compiled.last if variant == 'BM' else compiled.shift
+        size = len(table)
+        bm.count('ruby java python c# python', compiled)
+        restored = pickle.loads(pickle.dumps(compiled))
+        restored_ok &= len(table) == size and bm.count('python pythonpython', restored) == 3
+    
+    if restored_ok:
+        print("✅ Str shift tables stay fixed-size and pickle")
+    else:
+        print("❌ Str shift tables grew or failed to pickle")
+        all_passed = False
+    
+    # Wu-Manber multi-pattern counts against one count per pattern
+    mismatches = 0
+    for _ in range(500):
+        text = ''.join(rng.choice('ab ') for _ in range(rng.randint(0, 60))).encode()
+        patterns = [''.join(rng.choice('ab ') for _ in range(rng.randint(0, 6))).encode()
+                    for _ in range(rng.randint(1, 6))]
+        expected = [len(naive_search(text, pattern)) if pattern else 0 for pattern in patterns]
+        if bm.count_multiple(memoryview(text), bm.compile_multiple(patterns)) != expected:
+            mismatches += 1
+    
+    if mismatches:
+        print(f"❌ {mismatches} Wu-Manber mismatches on random text")
+        all_passed = False
+    else:
+        print("✅ Wu-Manber counts agree with per-pattern counts")
+    
     return all_passed
 
+def benchmark_variants(max_files: int = 60, max_pages: int = 3):
+    """Time every variant on the bundled data/ CVs and pick the fastest per pattern length"""
+    import importlib.util
+    import re
+    from pathlib import Path
+    
+    # Load the backend module by path, the utils package pulls in the database driver
+    src_root = Path(__file__).parent.parent
+    spec = importlib.util.spec_from_file_location('pdf_backends', src_root / 'utils' / 'pdf_backends.py')
+    pdf_backends = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pdf_backends)
+    
+    pdf_files = sorted((src_root.parent / 'data').glob('*/*.pdf'))
+    if not pdf_files or not pdf_backends.available_backends():
+        print("⚠️ No PDFs or PDF backend available, skipping Boyer-Moore benchmark")
+        return None
+    
+    # Spread the sample over all categories
+    step = max(1, len(pdf_files) // max_files)
+    texts = []
+    backend = pdf_backends.get_backend()
+    for path in pdf_files[::step][:max_files]:
+        try:
+            with backend.open(str(path)) as document:
+                pages = [document.page_text(i) for i in range(min(len(document), max_pages))]
+        except Exception:
+            continue
+        # Same folded bytes the search controller scans
+        texts.append(re.sub(r'\s+', ' ', ' '.join(pages)).strip().lower().encode('utf-8'))
+    if not texts:
+        print("⚠️ No CV text extracted, skipping Boyer-Moore benchmark")
+        return None
+    
+    size = sum(len(text) for text in texts)
+    print(f"\n⏱️ Boyer-Moore variants on {len(texts)} CVs ({size:,} bytes)")
+    
+    matcher = BoyerMooreMatcher()
+    timings = matcher.tune(texts)
+    print(f"   {'length':>6}  " + "  ".join(f"{variant:>9}" for variant in VARIANTS) + "  fastest")
+    for length, row in timings.items():
+        fastest = min(VARIANTS, key=lambda variant: row[variant])
+        print(f"   {length:>6}  " + "  ".join(f"{row[variant] * 1e3:7.1f}ms" for variant in VARIANTS)
+              + f"  {fastest}")
+    print(f"   AUTO_VARIANTS = {tuple(matcher.auto_variants)}")
+    return matcher.auto_variants
+
 if __name__ == "__main__":
     success = test_boyer_moore_consistency()
     if success:
         print("🎉 Boyer-Moore implementation is CORRECT!")
     else:
-        print("❌ Boyer-Moore needs more fixes!")
\ No newline at end of file
+        print("❌ Boyer-Moore needs more fixes!")
+    
+    benchmark_variants()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Offline Corpus Pre-indexing for ATS CV Search
+Extracts, normalizes and persists CV text ahead of the first search.
+Incremental: only new or changed PDFs are processed on re-runs.
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+
+# Add current directory to path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from utils.pdf_extractor import PDFExtractor
+from utils.packed_corpus import get_corpus_path
+from index.maintenance import IndexMaintainer
+
+def collect_cv_paths(from_data_dir: bool):
+    """Collect CV paths from database or data directory"""
+    if not from_data_dir:
+        from database.repo import ResumeRepository
+        cv_paths = ResumeRepository().get_all_cv_paths()
+        if cv_paths:
+            print(f"📋 Found {len(cv_paths)} CV paths in ApplicationDetail")
+            return cv_paths
+        print("⚠️ No CV paths from database, falling back to data directory")
+    
+    project_root = Path(__file__).parent.parent
+    data_dir = project_root / "data"
+    cv_paths = sorted(pdf.relative_to(project_root).as_posix() for pdf in data_dir.glob("*/*.pdf"))
+    print(f"📁 Found {len(cv_paths)} PDF files in {data_dir}")
+    return cv_paths
+
+def find_stale_paths(extractor: PDFExtractor, cv_paths):
+    """Split CV paths into (stale, up to date, missing, known failures)"""
+    stale = []
+    up_to_date = 0
+    missing = 0
+    known_failures = 0
+    
+    for cv_path in cv_paths:
+        full_path = extractor._resolve_path(cv_path)
+        if not full_path:
+            missing += 1
+            continue
+        
+        file_stat = os.stat(full_path)
+        store_key = extractor._store_key(full_path)
+        if extractor.text_store.is_fresh(store_key, file_stat):
+            up_to_date += 1
+        elif extractor.text_store.get_failure(store_key, file_stat):
+            known_failures += 1
+        else:
+            stale.append((cv_path, file_stat.st_size))
+    
+    return stale, up_to_date, missing, known_failures
+
+def build_index(from_data_dir: bool = False, workers: int = None, retry_failed: bool = False,
+                rebuild: bool = False):
+    """Extract and persist text for every new or changed CV"""
+    # Isolated workers keep malformed PDFs from stalling the run
+    extractor = PDFExtractor(isolated=True)
+    extractor.logger.setLevel(logging.WARNING)
+    if not extractor.text_store.enabled:
+        print("❌ Text store unavailable, nothing would be persisted")
+        return False
+    
+    if retry_failed:
+        print(f"🔁 Retrying {extractor.text_store.failure_count()} previously failed files")
+        extractor.text_store.clear_failures()
+    
+    cv_paths = collect_cv_paths(from_data_dir)
+    if not cv_paths:
+        print("❌ No CV paths found")
+        return False
+    
+    stale, up_to_date, missing, known_failures = find_stale_paths(extractor, cv_paths)
+    print(f"🔍 {len(stale)} new/changed, {up_to_date} up to date, "
+          f"{known_failures} known failures, {missing} missing")
+    
+    start_time = time.time()
+    results = {}
+    if stale:
+        results = extractor.extract_many(
+            [cv_path for cv_path, _ in stale],
+            workers=workers,
+            progress_callback=lambda message: print(f"   {message}", end="\r")
+        )
+        print()
+    elapsed = time.time() - start_time
+    extractor.close()
+    
+    # Throughput stats
+    total_bytes = sum(size for _, size in stale)
+    failures = [cv_path for cv_path, text in results.items() if not text]
+    files_per_sec = len(stale) / elapsed if elapsed > 0 else 0.0
+    mb_per_sec = total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+    
+    print(f"\n📊 Indexing Summary:")
+    print(f"   Processed: {len(stale)} files ({total_bytes / (1024 * 1024):.1f} MB) in {elapsed:.2f}s")
+    print(f"   Throughput: {files_per_sec:.1f} files/s, {mb_per_sec:.2f} MB/s")
+    print(f"   Failures: {len(failures)} new, {extractor.text_store.failure_count()} recorded")
+    for path, reason in extractor.text_store.get_failures()[:10]:
+        print(f"      ❌ {path}: {reason}")
+    print(f"   Stored texts: {extractor.text_store.count()} unique across "
+          f"{extractor.text_store.file_count()} files")
+    
+    # Pack and indexes: new texts go into delta segments, compaction folds them into the base
+    maintainer = IndexMaintainer(extractor)
+    stats = maintainer.sync(cv_paths, rebuild=rebuild)
+    if 'documents' in stats:
+        print(f"   Base segment: {stats['documents']} texts, {stats['blob_bytes'] / (1024 * 1024):.1f} MB packed, "
+              f"{stats['terms']} terms, {stats['trigrams']} trigrams "
+              f"in {stats['compaction_time']:.2f}s -> {get_corpus_path().parent}")
+    if stats['mode'] != 'rebuild':
+        print(f"   Delta segments: +{stats['added']} texts, -{stats['removed']} removed, "
+              f"{stats['segments']} segments, {stats['tombstones']} tombstones")
+    print(f"   Index update ({stats['mode']}) took {stats['elapsed']:.2f}s")
+    
+    return True
+
+def main():
+    """Main function to run pre-indexing"""
+    parser = argparse.ArgumentParser(description='ATS CV corpus pre-indexing')
+    parser.add_argument('--from-data-dir', action='store_true', help='Walk data/ instead of the database')
+    parser.add_argument('--workers', type=int, default=None, help='Extraction worker processes')
+    parser.add_argument('--retry-failed', action='store_true', help='Retry files recorded as failed')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild indexes from scratch instead of adding delta segments')
+    
+    args = parser.parse_args()
+    
+    print("=== ATS CV Search - Corpus Pre-indexing ===")
+    if build_index(from_data_dir=args.from_data_dir, workers=args.workers,
+                   retry_failed=args.retry_failed, rebuild=args.rebuild):
+        print("\n🎉 Pre-indexing completed successfully!")
+    else:
+        print("\n❌ Pre-indexing failed!")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
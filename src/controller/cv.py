@@ -10,15 +10,16 @@ from pathlib import Path
 from typing import Optional
 from database.models import CVSummary
 from database.repo import ResumeRepository
-from utils.pdf_extractor import PDFExtractor
+from utils.pdf_extractor import PDFExtractor, get_shared_extractor
 from utils.regex_extractor import RegexExtractor
 
 class CVController:
     """CV operations controller"""
     
-    def __init__(self):
+    def __init__(self, pdf_extractor: Optional[PDFExtractor] = None):
         self.repo = ResumeRepository()
-        self.pdf_extractor = PDFExtractor()
+        # Shared with SearchController so summaries of search hits are cache hits
+        self.pdf_extractor = pdf_extractor or get_shared_extractor()
         self.regex_extractor = RegexExtractor()
     
     def get_cv_text(self, resume_id: str) -> Optional[str]:
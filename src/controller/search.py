@@ -1,22 +1,104 @@
 """CV search controller"""
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
+import sys
 import time
-from database.models import SearchResult
+from dataclasses import replace
+from database.models import SearchResult, ResumeFilter
 from database.repo import ResumeRepository
-from utils.pdf_extractor import PDFExtractor
+from utils.pdf_extractor import PDFExtractor, get_shared_extractor
+from utils.packed_corpus import fold_text, open_packed_corpus
+from index.segments import index_stamp, load_indexes
+from index.maintenance import IndexMaintainer
+from index.ranking import RANKINGS, MatchCountRanking, BM25Ranking, clean_keyword
 from utils.timer import SearchTimer
+from utils.lru_cache import LRUCache
+from utils.top_k import TopK
+from utils.query import QueryPlan, UNKNOWN_SELECTIVITY
 from algorithm.kmp import KMPMatcher
 from algorithm.bm import BoyerMooreMatcher
 from algorithm.aho_corasick import AhoCorasick
 from algorithm.levenshtein import LevenshteinMatcher
 
+RESULT_CACHE_BYTES = 8 * 1024 * 1024
+MATCH_MEMO_BYTES = 4 * 1024 * 1024
+
+# Algorithms whose keyword counts are interchangeable share memo entries
+COUNT_SEMANTICS = {'KMP': 'KMP', 'INDEX': 'KMP', 'BM': 'BM', 'AC': 'AC'}
+
+def normalize_keywords(keywords: List[str]) -> Tuple[str, ...]:
+    """Order- and case-insensitive keyword key; matching folds case, spacing is kept"""
+    return tuple(sorted(keyword.lower() for keyword in keywords))
+
+def result_size(key, value) -> int:
+    """Approximate memory held by a cached (keywords, results) entry"""
+    keywords, results = value
+    size = sys.getsizeof(key) + sys.getsizeof(keywords) + sys.getsizeof(results)
+    for result in results:
+        size += sys.getsizeof(result) + sys.getsizeof(result.keyword_matches) + sys.getsizeof(result.matched_keywords)
+    return size
+
+def memo_size(key, count) -> int:
+    """Approximate memory held by a (content hash, keyword, semantics) -> count entry"""
+    return sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key) + sys.getsizeof(count)
+
+class ResultCollector:
+    """Streams matches into a bounded top-K heap ranked by relevance"""
+    
+    def __init__(self, keywords: List[str], max_results: Optional[int] = None, ranking=None):
+        self.keywords = keywords
+        self.max_results = max_results
+        self.ranking = ranking or MatchCountRanking(keywords)
+        self.top = TopK(max_results)
+        self.found_keywords = set()
+        self.match_count = 0
+    
+    def score(self, keyword_matches: Dict[str, float], algorithm: str,
+              content_hash: Optional[str] = None) -> Tuple[float, float]:
+        """Ranking key: (relevance score, total matches)"""
+        return self.ranking.score(keyword_matches, algorithm, content_hash), sum(keyword_matches.values())
+    
+    def offer(self, group, keyword_matches: Dict[str, int], algorithm: str,
+              order: Optional[int] = None, content_hash: Optional[str] = None):
+        """Offer matches for every resume sharing one text; results are built only if they rank"""
+        self.match_count += len(group)
+        self.found_keywords.update(clean_keyword(keyword) for keyword in keyword_matches)
+        
+        key = self.score(keyword_matches, algorithm, content_hash)
+        for i, resume in enumerate(group):
+            position = None if order is None else order + i
+            if not self.top.accepts(key, position):
+                # Later resumes in the group tie and lose on order
+                break
+            
+            result = SearchResult(
+                resume=resume,
+                keyword_matches=dict(keyword_matches),
+                total_matches=key[1],
+                matched_keywords=list(keyword_matches)
+            )
+            result.algorithm_used = algorithm
+            result.relevance_score = key[0]
+            self.top.push(key, result, position)
+    
+    def can_skip(self, keyword_bounds: Dict[str, float], algorithm: str, content_hash: Optional[str] = None) -> bool:
+        """True if a document whose keyword counts are at most these bounds cannot enter the top K"""
+        return self.top.can_skip(self.score(keyword_bounds, algorithm, content_hash))
+    
+    def unfound_keywords(self) -> List[str]:
+        """Keywords no offered document matched"""
+        return [keyword for keyword in self.keywords if keyword not in self.found_keywords]
+    
+    def results(self) -> List[SearchResult]:
+        """Kept results, best first"""
+        return self.top.items()
+
 class SearchController:
     """CV search controller"""
     
-    def __init__(self):
+    def __init__(self, pdf_extractor: Optional[PDFExtractor] = None):
         # Initialize components
         self.repo = ResumeRepository()
-        self.pdf_extractor = PDFExtractor()
+        self.pdf_extractor = pdf_extractor or get_shared_extractor()
         self.timer = SearchTimer()
         
         # Algorithm matchers
@@ -29,30 +111,64 @@ class SearchController:
         self.progress_callback = None
         self.max_cvs_to_process = 100
         self.batch_size = 10
+        self.extraction_workers = None  # None uses all cores
+        self.ranking = 'MATCHES'  # One of RANKINGS
+        self.packed_corpus = None  # Opened lazily from build_index output
+        self.fold_bytes = True  # Fold extracted text to UTF-8 bytes like the packed corpus
+        self.multi_pattern = True  # KMP/BM count all keywords in one pass over folded bytes
+        self.indexes = (None, None)  # (inverted, trigram) over base + delta segments
+        self.index_stamp = None
+        self.index_maintainer = IndexMaintainer(self.pdf_extractor)
+        self.result_cache = LRUCache(RESULT_CACHE_BYTES, sizeof=result_size)
+        self.match_memo = LRUCache(MATCH_MEMO_BYTES, sizeof=memo_size)
         
         # Performance tracking
         self.algorithm_stats = {
             'KMP': {'total_time': 0, 'searches': 0},
             'BM': {'total_time': 0, 'searches': 0},
             'AC': {'total_time': 0, 'searches': 0},
+            'INDEX': {'total_time': 0, 'searches': 0},
             'LEVENSHTEIN': {'total_time': 0, 'searches': 0}
         }
 
+    def close(self):
+        """Write queued delta segment texts and release the packed corpus"""
+        self.index_maintainer.flush()
+        if self.packed_corpus is not None:
+            self.packed_corpus.close()
+            self.packed_corpus = None
+
     def set_progress_callback(self, callback):
         """Set progress callback"""
         self.progress_callback = callback
 
     def search_cvs(self, keywords: List[str], algorithm: str = 'KMP', 
-                   max_results: int = 10, fuzzy_threshold: float = 0.7) -> Tuple[List[SearchResult], str]:
-        """Main search function"""
-        
-        print(f"🔍 Starting search: {keywords}, {algorithm}")
+                   max_results: int = 10, fuzzy_threshold: float = 0.7,
+                   match_all: bool = False, ranking: Optional[str] = None,
+                   query: Optional[QueryPlan] = None,
+                   filters: Optional[ResumeFilter] = None) -> Tuple[List[SearchResult], str]:
+        """Main search function, ranking defaults to self.ranking
+        
+        A parsed query filters CVs first; keywords should be its non-negated
+        keywords (query.keywords), which are counted and ranked as usual.
+        Category and birthdate filters (and a query's required category:)
+        run in SQL, so only that partition of CVs is read and searched.
+        """
+        
+        ranking = (ranking or self.ranking).upper()
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {ranking}, expected one of {RANKINGS}")
+        
+        print(f"🔍 Starting search: {keywords}, {algorithm}, ranked by {ranking}")
+        if not keywords:
+            return [], "No keywords to rank by"
         
         # Initialize timer
         self.timer.reset()
         
-        # Get resumes
-        all_resumes = self.repo.get_all_resumes()
+        # Get resumes, filtered in the database
+        filters = self._pushdown_filters(filters, query)
+        all_resumes = self.repo.get_resumes(filters)
         if not all_resumes:
             return [], "No CVs found"
         
@@ -64,29 +180,327 @@ class SearchController:
         for i, resume in enumerate(resumes[:3]):
             print(f"   {i+1}.{resume.id}: {resume.file_path}")
         
-        # Execute search
+        # Same query over an unchanged corpus returns the cached ranking
+        lookup_start = time.perf_counter()
+        cache_key = (
+            normalize_keywords(keywords), algorithm.upper(), max_results, fuzzy_threshold, match_all, ranking,
+            str(query) if query is not None else None, self._filters_key(filters), self._corpus_version(resumes, ranking)
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            top_results = self._rename_cached(cached, keywords)
+            lookup_us = (time.perf_counter() - lookup_start) * 1e6
+            print(f"⚡ Cache hit: {len(top_results)} results in {lookup_us:.0f}µs")
+            return top_results, f"Cached ({lookup_us:.0f}µs) | {self._generate_timing_summary()}"
+        
+        warmed = False
+        if query is not None and not query.is_simple:
+            # Filter reads CV text, extract it in parallel first
+            self._warm_texts(resumes)
+            warmed = True
+            # Boolean filter short-circuits per CV before any counting
+            resumes = self._filter_query(resumes, query, algorithm.upper())
+            print(f"🔎 Query {query}: {len(resumes)} CVs match")
+        
+        if match_all and algorithm.upper() != 'LEVENSHTEIN':
+            # Trigram misses are dropped unread, the rest are extracted in parallel and checked in cache
+            resumes = self._filter_match_all(resumes, keywords, algorithm.upper())
+            print(f"🔎 Match all: {len(resumes)} CVs contain every keyword")
+        elif not warmed:
+            self._warm_texts(resumes)
+        
+        # Execute search, ranking as matches stream in
+        collector = ResultCollector(keywords, max_results, self._get_ranking(ranking, keywords))
         if algorithm.upper() == 'LEVENSHTEIN':
-            results = self._execute_fuzzy_search(resumes, keywords, fuzzy_threshold)
+            self._execute_fuzzy_search(resumes, keywords, fuzzy_threshold, collector)
         else:
-            results = self._execute_exact_search(resumes, keywords, algorithm, fuzzy_threshold, max_results)
+            self._execute_exact_search(resumes, keywords, algorithm, fuzzy_threshold, max_results, collector)
         
-        # Calculate and sort
-        results = self._calculate_relevance_scores(results, keywords)
-        results.sort(key=lambda x: (x.relevance_score, x.total_matches), reverse=True)
+        # Keep indexes current with CVs added since the last build
+        self._index_new_texts(resumes)
         
         # Return top results
-        top_results = results[:max_results]
+        top_results = collector.results()
+        self.result_cache.put(cache_key, (tuple(keywords), top_results))
+        # Callers get their own keyword containers, never the cached ones
+        top_results = self._rename_cached((tuple(keywords), top_results), keywords)
         timing_summary = self._generate_timing_summary()
         
-        print(f"🎯 Completed: {len(top_results)} results")
+        print(f"🎯 Completed: top {len(top_results)} of {collector.match_count} matches")
         
         # Show statistics
         stats = self.pdf_extractor.get_extraction_stats()
         print(f"📊 PDF: {stats['cached_files']} success, {stats['failed_files']} failed")
+        print(f"📊 Cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses, "
+              f"{stats['cache_evictions']} evicted, {stats['cache_bytes'] / (1024 * 1024):.1f}MB used")
         
         return top_results, timing_summary
 
-    def _execute_exact_search(self, resumes, keywords, algorithm, fuzzy_threshold, max_results):
+    def _warm_texts(self, resumes):
+        """Warm text cache in parallel, packed texts are scanned in place"""
+        corpus = self._get_packed_corpus()
+        self.pdf_extractor.extract_many(
+            [resume.file_path for resume in resumes
+             if corpus is None or self.pdf_extractor.content_hash(resume.file_path) not in corpus],
+            workers=self.extraction_workers,
+            progress_callback=self.progress_callback
+        )
+
+    def _pushdown_filters(self, filters, query):
+        """Add categories a query requires to filters that do not restrict categories"""
+        categories = query.required_categories() if query is not None else []
+        if not categories or (filters is not None and filters.categories):
+            return filters
+        
+        filters = replace(filters) if filters is not None else ResumeFilter()
+        filters.categories = categories
+        print(f"🔎 Category filter pushed down: {categories}")
+        return filters
+
+    @staticmethod
+    def _filters_key(filters):
+        """Hashable form of resume filters"""
+        if filters is None or filters.is_empty():
+            return None
+        return (tuple(sorted(filters.categories)), filters.birthdate_from, filters.birthdate_to)
+
+    def _corpus_version(self, resumes, ranking):
+        """Fingerprint of the searched CV rows, their files, the extractor and the index"""
+        files = tuple(self.pdf_extractor.file_signature(resume.file_path) for resume in resumes)
+        rows = tuple((resume.id, resume.file_path, resume.category, resume.name, resume.birthdate) for resume in resumes)
+        # Delta segments hold texts searches already scanned, only BM25 statistics change with them
+        stamp = index_stamp() if ranking == 'BM25' else index_stamp()[:2]
+        return hash((rows, files, self.pdf_extractor.text_store.version, stamp))
+
+    @staticmethod
+    def _rename_cached(cached, keywords):
+        """Copy cached results, naming keywords as this query spelled them"""
+        cached_keywords, results = cached
+        rename = dict(zip(sorted(cached_keywords, key=str.lower), sorted(keywords, key=str.lower)))
+        
+        def rename_keyword(keyword):
+            base = clean_keyword(keyword)
+            return keyword.replace(base, rename.get(base, base), 1)
+        
+        return [
+            replace(
+                result,
+                keyword_matches={rename_keyword(keyword): count for keyword, count in result.keyword_matches.items()},
+                matched_keywords=[rename_keyword(keyword) for keyword in result.matched_keywords]
+            )
+            for result in results
+        ]
+
+    def _get_packed_corpus(self):
+        """Open packed corpus, reopening after build_index rewrites it"""
+        if self.packed_corpus is not None and self.packed_corpus.is_stale():
+            self.packed_corpus.close()
+            self.packed_corpus = None
+        
+        if self.packed_corpus is None:
+            self.packed_corpus = open_packed_corpus(self.pdf_extractor.text_store.version)
+        
+        return self.packed_corpus
+
+    def _get_indexes(self):
+        """Load index segments, reloading after a rebuild, new delta segment or compaction"""
+        stamp = index_stamp()
+        if stamp != self.index_stamp:
+            self.indexes = load_indexes(self.pdf_extractor.text_store.version)
+            self.index_stamp = stamp
+        
+        return self.indexes
+
+    def _get_inverted_index(self):
+        """Get inverted index for the INDEX algorithm"""
+        return self._get_indexes()[0]
+
+    def _get_trigram_index(self):
+        """Get trigram index used to prune substring scans"""
+        return self._get_indexes()[1]
+
+    def _get_ranking(self, ranking, keywords):
+        """Build the ranking function for one query"""
+        if ranking == 'BM25':
+            index = self._get_inverted_index()
+            if index is not None:
+                return BM25Ranking(index, keywords)
+            print("⚠️ No inverted index, run build_index.py; BM25 falls back to match counts")
+        
+        return MatchCountRanking(keywords)
+
+    def _index_new_texts(self, resumes):
+        """Queue texts extracted during this search for a delta segment"""
+        inverted_index = self._get_inverted_index()
+        if inverted_index is None:
+            # No base segment yet, build_index.py creates it
+            return
+        
+        texts = {}
+        for resume in resumes:
+            content_hash = self.pdf_extractor.content_hash(resume.file_path)
+            if not content_hash or content_hash in texts or inverted_index.doc_id(content_hash) is not None:
+                continue
+            text = self.pdf_extractor.peek_text(resume.file_path)
+            if text:
+                texts[content_hash] = text
+        
+        if not texts:
+            return
+        
+        # Written off the UI thread, searches shortly after each other share one segment
+        queued = self.index_maintainer.queue_documents(texts.items())
+        if queued:
+            print(f"🗂️ Queued {queued} new CVs for a delta segment")
+
+    def _candidate_keywords(self, groups, keywords):
+        """Map content hash -> keywords whose trigrams all occur in that CV, None without an index"""
+        index = self._get_trigram_index()
+        if index is None:
+            return None
+        
+        keyword_candidates = [(keyword, index.candidates(keyword)) for keyword in keywords]
+        candidate_keywords = {}
+        for content_hash, _ in groups:
+            doc_id = index.doc_id(content_hash)
+            if doc_id is None:
+                # Not indexed yet, every keyword must be scanned
+                continue
+            candidate_keywords[content_hash] = [
+                keyword for keyword, candidates in keyword_candidates
+                if candidates is None or doc_id in candidates
+            ]
+        
+        return candidate_keywords
+
+    def _group_by_content(self, resumes):
+        """Group resumes whose PDFs have identical content, as (content_hash, resumes)"""
+        groups = {}
+        
+        for resume in resumes:
+            content_hash = self.pdf_extractor.content_hash(resume.file_path)
+            # Unreadable files keep a group of their own
+            key = content_hash or resume.file_path
+            if key not in groups:
+                groups[key] = (content_hash, [])
+            groups[key][1].append(resume)
+        
+        return list(groups.values())
+
+    def _filter_match_all(self, resumes, keywords, algorithm='KMP'):
+        """Keep resumes containing every keyword"""
+        kept = []
+        contains = self._exists_checker(algorithm)
+        groups = self._group_by_content(resumes)
+        corpus = self._get_packed_corpus()
+        patterns = [fold_text(keyword) for keyword in keywords if keyword.strip()]
+        candidate_keywords = self._candidate_keywords(groups, keywords) or {}
+        
+        # Missing trigrams rule the CV out without reading it
+        groups = [
+            (content_hash, group) for content_hash, group in groups
+            if len(candidate_keywords.get(content_hash, keywords)) >= len(keywords)
+        ]
+        
+        # Survivors are counted next, extract them in parallel so the check reads cached text
+        self.pdf_extractor.extract_many(
+            [group[0].file_path for content_hash, group in groups
+             if corpus is None or content_hash not in corpus],
+            workers=self.extraction_workers,
+            progress_callback=self.progress_callback
+        )
+        
+        for idx, (content_hash, group) in enumerate(groups):
+            if self.progress_callback and idx % 10 == 0:
+                progress = int((idx / len(groups)) * 100)
+                self.progress_callback(f"Filter: {idx+1}/{len(groups)} ({progress}%)")
+            
+            # Packed texts are searched inside the mapping without copying
+            if corpus is not None and content_hash in corpus:
+                if all(self._packed_contains(corpus, content_hash, pattern, contains) for pattern in patterns):
+                    kept.extend(group)
+            elif self.pdf_extractor.contains_all_keywords(group[0].file_path, keywords, contains):
+                kept.extend(group)
+        
+        return kept
+
+    def _exists_checker(self, algorithm):
+        """Exists-only test for the chosen matcher, stops at the first occurrence"""
+        if algorithm == 'KMP':
+            return lambda text, keyword: self.kmp_matcher.contains(
+                text, self.kmp_matcher.compile(keyword, use_dfa=True))
+        if algorithm == 'BM':
+            return self.bm_matcher.contains
+        # AC and INDEX keep the built-in substring test
+        return None
+
+    @staticmethod
+    def _packed_contains(corpus, content_hash, pattern, contains):
+        """Exists-only test inside a packed text, with the matcher's contains() when given"""
+        if contains is None:
+            return corpus.contains(content_hash, pattern)
+        return contains(corpus.view(content_hash), pattern)
+
+    def _filter_query(self, resumes, query, algorithm='KMP'):
+        """Keep resumes satisfying a boolean query, cheapest and most selective clauses first"""
+        kept = []
+        matcher_contains = self._exists_checker(algorithm)
+        groups = self._group_by_content(resumes)
+        corpus = self._get_packed_corpus()
+        trigram_index = self._get_trigram_index()
+        
+        # Trigram candidates give both selectivity estimates and free negatives
+        candidates = {}
+        if trigram_index is not None:
+            candidates = {keyword: trigram_index.candidates(keyword) for keyword in query.terms}
+        
+        def selectivity(keyword):
+            keyword_candidates = candidates.get(keyword)
+            if keyword_candidates is None or not len(trigram_index):
+                return UNKNOWN_SELECTIVITY
+            return len(keyword_candidates) / len(trigram_index)
+        
+        query.optimize(selectivity)
+        
+        for idx, (content_hash, group) in enumerate(groups):
+            if self.progress_callback and idx % 10 == 0:
+                progress = int((idx / len(groups)) * 100)
+                self.progress_callback(f"Query: {idx+1}/{len(groups)} ({progress}%)")
+            
+            doc_id = trigram_index.doc_id(content_hash) if trigram_index is not None else None
+            contains = self._presence_checker(content_hash, group[0].file_path, corpus, doc_id, candidates,
+                                              matcher_contains)
+            # Resumes sharing a text differ in fields, the presence memo is shared
+            kept.extend(resume for resume in group if query.matches(resume, contains))
+        
+        return kept
+
+    def _presence_checker(self, content_hash, file_path, corpus, doc_id, candidates, matcher_contains=None):
+        """Memoized keyword presence test for one CV text, reading it only when needed"""
+        seen = {}
+        text = []
+        
+        def contains(keyword):
+            if keyword in seen:
+                return seen[keyword]
+            
+            keyword_candidates = candidates.get(keyword)
+            pattern = keyword.lower()
+            if doc_id is not None and keyword_candidates is not None and doc_id not in keyword_candidates:
+                found = False
+            elif corpus is not None and content_hash in corpus:
+                found = self._packed_contains(corpus, content_hash, fold_text(pattern), matcher_contains)
+            else:
+                if not text:
+                    text.append((self.pdf_extractor.extract_text(file_path) or '').lower())
+                found = matcher_contains(text[0], pattern) if matcher_contains else pattern in text[0]
+            
+            seen[keyword] = found
+            return found
+        
+        return contains
+
+    def _execute_exact_search(self, resumes, keywords, algorithm, fuzzy_threshold, max_results, collector):
         """Execute exact search with fallback"""
         
         # Start exact search
@@ -95,9 +509,11 @@ class SearchController:
         
         # Choose algorithm
         if algorithm.upper() == 'AC':
-            exact_results = self._aho_corasick_search(resumes, keywords)
+            self._aho_corasick_search(resumes, keywords, collector)
+        elif algorithm.upper() == 'INDEX':
+            self._index_search(resumes, keywords, collector)
         else:
-            exact_results = self._batched_exact_search(resumes, keywords, algorithm)
+            self._batched_exact_search(resumes, keywords, algorithm, collector)
         
         # Update statistics
         exact_time = time.time() - start_time
@@ -105,152 +521,318 @@ class SearchController:
         self.algorithm_stats[algorithm.upper()]['searches'] += 1
         
         self.timer.stop_exact_search()
-        print(f"✅ Exact: {len(exact_results)} matches in {exact_time:.3f}s")
+        exact_matches = collector.match_count
+        print(f"✅ Exact: {exact_matches} matches in {exact_time:.3f}s")
         
         # Fuzzy fallback if needed
-        unfound_keywords = self._get_unfound_keywords(exact_results, keywords)
-        fuzzy_results = []
+        unfound_keywords = collector.unfound_keywords()
         
-        if unfound_keywords and len(exact_results) < max_results:
+        if unfound_keywords and exact_matches < max_results:
             print(f"🔍 Fuzzy fallback: {unfound_keywords}")
             self.timer.start_fuzzy_search(len(unfound_keywords))
             
             start_time = time.time()
             fuzzy_resumes = resumes[:50]
-            fuzzy_results = self._fuzzy_search(fuzzy_resumes, unfound_keywords, fuzzy_threshold)
+            self._fuzzy_search(fuzzy_resumes, unfound_keywords, fuzzy_threshold, collector)
             
             fuzzy_time = time.time() - start_time
             self.algorithm_stats['LEVENSHTEIN']['total_time'] += fuzzy_time
             self.algorithm_stats['LEVENSHTEIN']['searches'] += 1
             
             self.timer.stop_fuzzy_search()
-            print(f"✅ Fuzzy: {len(fuzzy_results)} matches in {fuzzy_time:.3f}s")
-        
-        return exact_results + fuzzy_results
+            print(f"✅ Fuzzy: {collector.match_count - exact_matches} matches in {fuzzy_time:.3f}s")
 
-    def _execute_fuzzy_search(self, resumes, keywords, threshold):
+    def _execute_fuzzy_search(self, resumes, keywords, threshold, collector):
         """Execute fuzzy-only search"""
         
         print(f"🔍 Fuzzy-only: threshold {threshold}")
         self.timer.start_fuzzy_search(len(keywords))
         
         start_time = time.time()
-        results = self._fuzzy_search(resumes, keywords, threshold)
+        self._fuzzy_search(resumes, keywords, threshold, collector)
         fuzzy_time = time.time() - start_time
         
         self.algorithm_stats['LEVENSHTEIN']['total_time'] += fuzzy_time
         self.algorithm_stats['LEVENSHTEIN']['searches'] += 1
         
         self.timer.stop_fuzzy_search()
-        print(f"✅ Fuzzy completed: {len(results)} results in {fuzzy_time:.3f}s")
-        
-        return results
+        print(f"✅ Fuzzy completed: {collector.match_count} results in {fuzzy_time:.3f}s")
 
-    def _batched_exact_search(self, resumes, keywords, algorithm):
+    def _batched_exact_search(self, resumes, keywords, algorithm, collector=None, label=None):
         """Exact search with batch processing"""
-        results = []
+        collector = collector or ResultCollector(keywords)
         successful_extractions = 0
         failed_extractions = 0
         
-        total_batches = (len(resumes) + self.batch_size - 1) // self.batch_size
+        # Scan each unique text once, hits fan out to every resume sharing it
+        groups = self._group_by_content(resumes)
+        corpus = self._get_packed_corpus()
+        total_batches = (len(groups) + self.batch_size - 1) // self.batch_size
+        
+        # Trigram pruning: only scan keywords that can occur in each CV
+        candidate_keywords = self._candidate_keywords(groups, keywords) or {}
+        pruned = 0
+        memo_only = 0
         
         for batch_idx in range(total_batches):
             start_idx = batch_idx * self.batch_size
-            end_idx = min(start_idx + self.batch_size, len(resumes))
-            batch_resumes = resumes[start_idx:end_idx]
+            end_idx = min(start_idx + self.batch_size, len(groups))
+            batch_groups = groups[start_idx:end_idx]
             
             if self.progress_callback:
                 progress = (batch_idx + 1) / total_batches * 100
                 self.progress_callback(f"{algorithm}: batch {batch_idx + 1}/{total_batches} ({progress:.0f}%)")
             
-            for resume in batch_resumes:
+            for content_hash, group in batch_groups:
+                resume = group[0]
+                scan_keywords = candidate_keywords.get(content_hash, keywords)
+                if not scan_keywords:
+                    pruned += len(group)
+                    continue
+                
                 try:
-                    cv_text = self.pdf_extractor.extract_text(resume.file_path)
-                    if not cv_text or len(cv_text.strip()) < 50:
-                        continue
-                    
-                    successful_extractions += 1
-                    sample_text = cv_text[:100].replace('\n', ' ')
-                    print(f"📝 Sample: {sample_text}...")
-                    
-                    # Search using algorithm
-                    if algorithm.upper() == 'KMP':
-                        matches = self._kmp_search_keywords(cv_text, keywords)
-                    elif algorithm.upper() == 'BM':
-                        matches = self._bm_search_keywords(cv_text, keywords)
+                    # Keywords counted in this CV by earlier searches need no scan
+                    matches, missing = self._memoized_counts(content_hash, scan_keywords, algorithm.upper())
+                    if not missing:
+                        memo_only += len(group)
                     else:
-                        continue
-                    
-                    # Process matches
-                    if matches:
-                        keyword_matches = {}
-                        total_matches = 0
-                        matched_keywords = []
+                        # Packed texts are folded UTF-8 views into the mapping
+                        cv_text = corpus.view(content_hash) if corpus is not None else None
+                        if cv_text is None:
+                            cv_text = self.pdf_extractor.extract_text(resume.file_path)
+                            if not cv_text or len(cv_text.strip()) < 50:
+                                continue
+                        elif len(cv_text) < 50:
+                            continue
                         
-                        for keyword, count in matches.items():
-                            if count > 0:
-                                keyword_matches[keyword] = count
-                                total_matches += count
-                                matched_keywords.append(keyword)
-                                print(f"✅ Found '{keyword}' {count}x in {resume.id}")
+                        sample = cv_text[:100] if isinstance(cv_text, str) else str(cv_text[:100], 'utf-8', 'ignore')
+                        sample_text = sample.replace('\n', ' ')
+                        print(f"📝 Sample: {sample_text}...")
                         
-                        if total_matches > 0:
-                            result = SearchResult(
-                                resume=resume,
-                                keyword_matches=keyword_matches,
-                                total_matches=total_matches,
-                                matched_keywords=matched_keywords
-                            )
-                            result.algorithm_used = algorithm.upper()
-                            results.append(result)
-                            
+                        # Search using algorithm
+                        if algorithm.upper() == 'KMP':
+                            scanned = self._kmp_search_keywords(cv_text, missing)
+                        elif algorithm.upper() == 'BM':
+                            scanned = self._bm_search_keywords(cv_text, missing)
+                        else:
+                            continue
+                        self._memoize_counts(content_hash, scanned, algorithm.upper())
+                        matches.update(scanned)
+                    
+                    successful_extractions += len(group)
+                    
+                    # Process matches, keyword order as given
+                    keyword_matches = {}
+                    for keyword in scan_keywords:
+                        count = matches[keyword]
+                        if count > 0:
+                            keyword_matches[keyword] = count
+                            print(f"✅ Found '{keyword}' {count}x in {resume.id}")
+                    
+                    if keyword_matches:
+                        collector.offer(group, keyword_matches, label or algorithm.upper(), content_hash=content_hash)
+                    
                 except Exception as e:
-                    failed_extractions += 1
+                    failed_extractions += len(group)
                     print(f"⚠️ Error: {resume.id}: {e}")
                     continue
         
-        print(f"📊 Extraction: {successful_extractions} success, {failed_extractions} failed")
-        return results
+        print(f"📊 Extraction: {successful_extractions} success, {failed_extractions} failed "
+              f"({len(groups)} unique texts, {pruned} pruned by trigrams, {memo_only} answered from memo)")
+        return collector.results()
+
+    def _memoized_counts(self, content_hash, keywords, algorithm):
+        """Split keywords into memoized counts for this CV and keywords still to scan"""
+        if not content_hash:
+            return {}, list(keywords)
+        
+        semantics = COUNT_SEMANTICS[algorithm]
+        counts = {}
+        missing = []
+        for keyword in keywords:
+            count = self.match_memo.get((content_hash, keyword.lower(), semantics))
+            if count is None:
+                missing.append(keyword)
+            else:
+                counts[keyword] = count
+        return counts, missing
+
+    def _memoize_counts(self, content_hash, counts, algorithm):
+        """Remember scanned counts (zeros included) for later searches"""
+        if not content_hash:
+            return
+        
+        semantics = COUNT_SEMANTICS[algorithm]
+        for keyword, count in counts.items():
+            self.match_memo.put((content_hash, keyword.lower(), semantics), count)
+
+    def _fold(self, text):
+        """Folded text for the exact matchers, bytes unless byte folding is off"""
+        if not isinstance(text, str):
+            # Packed corpus views are folded at ingestion
+            return text
+        return fold_text(text) if self.fold_bytes else text.lower()
 
     def _kmp_search_keywords(self, text, keywords):
-        """Search using KMP - fixed to handle dictionary return"""
+        """Search using KMP, counting matches without recording positions"""
         matches = {}
-        text_lower = text.lower()
+        # Folded bytes are matched with UTF-8 patterns and 256-entry DFA rows
+        text_lower = self._fold(text)
+        packed = not isinstance(text_lower, str)
+        
+        if packed and self.multi_pattern and len(keywords) > 1:
+            # One DFA over all keywords, the failure function generalises LPS
+            compiled = self.kmp_matcher.compile_multiple(tuple(fold_text(keyword) for keyword in keywords))
+            return dict(zip(keywords, self.kmp_matcher.count_multiple(text_lower, compiled)))
         
         for keyword in keywords:
-            keyword_lower = keyword.lower()
-            # KMP returns {pattern: [positions]} - extract positions correctly
-            result_dict = self.kmp_matcher.search(text_lower, keyword_lower)
-            
-            if result_dict and keyword_lower in result_dict:
-                positions = result_dict[keyword_lower]
-                matches[keyword] = len(positions)
-            else:
-                matches[keyword] = 0
+            keyword_lower = fold_text(keyword) if packed else keyword.lower()
+            # Compiled once per pattern (LPS + DFA) and reused for every CV
+            compiled = self.kmp_matcher.compile(keyword_lower, use_dfa=True)
+            # Ranking only needs counts, no position list is built
+            matches[keyword] = self.kmp_matcher.count(text_lower, compiled)
         
         return matches
 
     def _bm_search_keywords(self, text, keywords):
         """Search using Boyer-Moore"""
         matches = {}
-        text_lower = text.lower()
+        # Folded bytes use 256-entry shift tables instead of dict lookups
+        text_lower = self._fold(text)
+        packed = not isinstance(text_lower, str)
+        
+        if packed and self.multi_pattern and len(keywords) > 1:
+            # Wu-Manber: Horspool-style block shifts for all keywords in one pass
+            compiled = self.bm_matcher.compile_multiple(tuple(fold_text(keyword) for keyword in keywords))
+            return dict(zip(keywords, self.bm_matcher.count_multiple(text_lower, compiled)))
         
         for keyword in keywords:
-            keyword_lower = keyword.lower()
-            # BM returns [positions] directly
-            positions = self.bm_matcher.search(text_lower, keyword_lower)
-            matches[keyword] = len(positions)
+            keyword_lower = fold_text(keyword) if packed else keyword.lower()
+            # Shift tables built once per pattern, variant picked by pattern length
+            compiled = self.bm_matcher.compile(keyword_lower)
+            matches[keyword] = self.bm_matcher.count(text_lower, compiled)
         
         return matches
 
-    def _fuzzy_search(self, resumes, keywords, threshold):
+    def _index_search(self, resumes, keywords, collector=None):
+        """Inverted index search, same keyword counts as the KMP scan"""
+        collector = collector or ResultCollector(keywords)
+        index = self._get_inverted_index()
+        if index is None:
+            print("⚠️ No inverted index, run build_index.py; falling back to KMP scan")
+            return self._batched_exact_search(resumes, keywords, 'KMP', collector, label='INDEX')
+        
+        groups = self._group_by_content(resumes)
+        corpus = self._get_packed_corpus()
+        trigram_index = self._get_trigram_index()
+        
+        # Resume position of each group keeps ties in scan order
+        indexed = {}
+        unindexed = []
+        order = 0
+        for content_hash, group in groups:
+            doc_id = index.doc_id(content_hash)
+            if doc_id is None:
+                unindexed.append((order, content_hash, group))
+            elif index.doc_chars[doc_id] >= 50:
+                indexed[doc_id] = (order, group)
+            order += len(group)
+        
+        # Word-only keywords are counted straight from postings; others get
+        # per-doc occurrence bounds and are verified with KMP only if needed.
+        # Postings are read only for this search's partition of docs
+        partition = sorted(indexed)
+        exact_counts = {}
+        bounds = {}
+        for keyword in keywords:
+            if index.is_word_query(keyword):
+                exact_counts[keyword] = index.count_occurrences(keyword, partition)
+                continue
+            
+            keyword_bounds = index.candidate_bounds(keyword, partition)
+            if keyword_bounds is None:
+                keyword_bounds = dict.fromkeys(indexed, float('inf'))
+            if trigram_index is not None:
+                trigram_candidates = trigram_index.candidates(keyword)
+                if trigram_candidates is not None:
+                    keyword_bounds = {
+                        doc_id: bound for doc_id, bound in keyword_bounds.items()
+                        if trigram_index.doc_id(index.doc_keys[doc_id]) in trigram_candidates
+                    }
+            bounds[keyword] = keyword_bounds
+        
+        # Unindexed CVs have no bounds, scan their extracted text
+        for position, content_hash, group in unindexed:
+            counts, missing = self._memoized_counts(content_hash, keywords, 'INDEX')
+            if missing:
+                cv_text = self.pdf_extractor.extract_text(group[0].file_path)
+                if not cv_text or len(cv_text.strip()) < 50:
+                    continue
+                scanned = self._kmp_search_keywords(cv_text, missing)
+                self._memoize_counts(content_hash, scanned, 'INDEX')
+                counts.update(scanned)
+            matches = {keyword: counts[keyword] for keyword in keywords if counts[keyword] > 0}
+            if matches:
+                collector.offer(group, matches, 'INDEX', position, content_hash)
+        
+        # Max-score order: once the best remaining bound cannot beat the
+        # K-th kept score, no later document can either
+        candidates = []
+        for doc_id in indexed:
+            content_hash = index.doc_keys[doc_id]
+            known = {keyword: counts[doc_id] for keyword, counts in exact_counts.items() if counts.get(doc_id)}
+            pending = [keyword for keyword, keyword_bounds in bounds.items() if keyword_bounds.get(doc_id)]
+            # Memoized counts replace bounds with exact values
+            memoized, pending = self._memoized_counts(content_hash, pending, 'INDEX')
+            known.update((keyword, count) for keyword, count in memoized.items() if count)
+            if not known and not pending:
+                continue
+            keyword_bounds = dict(known)
+            keyword_bounds.update((keyword, bounds[keyword][doc_id]) for keyword in pending)
+            candidates.append((collector.score(keyword_bounds, 'INDEX', content_hash),
+                               keyword_bounds, doc_id, known, pending))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        
+        verified = 0
+        skipped = 0
+        for idx, (_, keyword_bounds, doc_id, known, pending) in enumerate(candidates):
+            content_hash = index.doc_keys[doc_id]
+            if collector.can_skip(keyword_bounds, 'INDEX', content_hash):
+                skipped = len(candidates) - idx
+                break
+            
+            position, group = indexed[doc_id]
+            counts = dict(known)
+            if pending:
+                text = corpus.view(content_hash) if corpus is not None else None
+                if text is None:
+                    text = self.pdf_extractor.extract_text(group[0].file_path)
+                if text:
+                    scanned = self._kmp_search_keywords(text, pending)
+                    self._memoize_counts(content_hash, scanned, 'INDEX')
+                    counts.update(scanned)
+                verified += 1
+            
+            # Keyword order as given, like the scan paths
+            matches = {keyword: counts[keyword] for keyword in keywords if counts.get(keyword)}
+            
+            if matches:
+                collector.offer(group, matches, 'INDEX', position, content_hash)
+        
+        print(f"📊 Index: {len(indexed)} indexed, {len(unindexed)} scanned, "
+              f"{verified} candidates verified, {skipped} skipped by score bound")
+        return collector.results()
+
+    def _fuzzy_search(self, resumes, keywords, threshold, collector=None):
         """Fuzzy search using Levenshtein Distance"""
-        results = []
+        collector = collector or ResultCollector(keywords)
+        groups = self._group_by_content(resumes)
         
-        for idx, resume in enumerate(resumes):
+        for idx, (content_hash, group) in enumerate(groups):
+            resume = group[0]
             if self.progress_callback and idx % 5 == 0:
-                progress = int((idx / len(resumes)) * 100)
-                self.progress_callback(f"Fuzzy: {idx+1}/{len(resumes)} ({progress}%)")
+                progress = int((idx / len(groups)) * 100)
+                self.progress_callback(f"Fuzzy: {idx+1}/{len(groups)} ({progress}%)")
             
             try:
                 cv_text = self.pdf_extractor.extract_text(resume.file_path)
@@ -259,8 +841,6 @@ class SearchController:
                 
                 # Fuzzy matching
                 fuzzy_matches = {}
-                total_fuzzy_matches = 0
-                matched_keywords = []
                 
                 for keyword in keywords:
                     # Use fuzzy_search_multiple method
@@ -270,104 +850,68 @@ class SearchController:
                         fuzzy_key = f"{keyword} (fuzzy)"
                         match_count = len(matches[keyword.lower()])
                         fuzzy_matches[fuzzy_key] = match_count
-                        total_fuzzy_matches += match_count
-                        matched_keywords.append(fuzzy_key)
                         print(f"🔍 Fuzzy '{keyword}' {match_count}x in {resume.id}")
                 
-                if total_fuzzy_matches > 0:
-                    result = SearchResult(
-                        resume=resume,
-                        keyword_matches=fuzzy_matches,
-                        total_matches=total_fuzzy_matches,
-                        matched_keywords=matched_keywords
-                    )
-                    result.algorithm_used = 'LEVENSHTEIN'
-                    results.append(result)
+                if fuzzy_matches:
+                    collector.offer(group, fuzzy_matches, 'LEVENSHTEIN', content_hash=content_hash)
                     
             except Exception as e:
                 print(f"⚠️ Fuzzy error {resume.id}: {e}")
                 continue
         
-        return results
+        return collector.results()
 
-    def _aho_corasick_search(self, resumes, keywords):
+    def _aho_corasick_search(self, resumes, keywords, collector=None):
         """Aho-Corasick search implementation"""
-        results = []
+        collector = collector or ResultCollector(keywords)
         successful_extractions = 0
         failed_extractions = 0
         
         # Build automaton once for all keywords
         self.aho_corasick.build_automaton(keywords)
         
-        for resume in resumes:
+        corpus = self._get_packed_corpus()
+        groups = self._group_by_content(resumes)
+        candidate_keywords = self._candidate_keywords(groups, keywords) or {}
+        
+        for content_hash, group in groups:
+            resume = group[0]
+            if not candidate_keywords.get(content_hash, keywords):
+                # No keyword can occur, skip the scan
+                continue
+            
             try:
-                cv_text = self.pdf_extractor.extract_text(resume.file_path)
-                if not cv_text or len(cv_text.strip()) < 50:
-                    continue
+                counts, missing = self._memoized_counts(content_hash, keywords, 'AC')
+                if missing:
+                    cv_text = corpus.text(content_hash) if corpus is not None else None
+                    if cv_text is None:
+                        cv_text = self.pdf_extractor.extract_text(resume.file_path)
+                    if not cv_text or len(cv_text.strip()) < 50:
+                        continue
+                    
+                    # Search using AC, results are keyed by folded pattern
+                    matches = self.aho_corasick.search_multiple(cv_text.lower(), missing)
+                    scanned = {keyword: len(matches.get(keyword.strip().lower(), [])) for keyword in missing}
+                    self._memoize_counts(content_hash, scanned, 'AC')
+                    counts.update(scanned)
                 
-                successful_extractions += 1
+                successful_extractions += len(group)
                 
-                # Search using AC
-                matches = self.aho_corasick.search_multiple(cv_text.lower(), keywords)
+                # Keyword order and spelling as given, like the other exact paths
+                keyword_matches = {}
+                for keyword in keywords:
+                    if counts[keyword]:
+                        keyword_matches[keyword] = counts[keyword]
+                if keyword_matches:
+                    collector.offer(group, keyword_matches, 'AC', content_hash=content_hash)
                 
-                if matches:
-                    keyword_matches = {}
-                    total_matches = 0
-                    matched_keywords = []
-                    
-                    for keyword, positions in matches.items():
-                        count = len(positions)
-                        if count > 0:
-                            keyword_matches[keyword] = count
-                            total_matches += count
-                            matched_keywords.append(keyword)
-                    
-                    if total_matches > 0:
-                        result = SearchResult(
-                            resume=resume,
-                            keyword_matches=keyword_matches,
-                            total_matches=total_matches,
-                            matched_keywords=matched_keywords
-                        )
-                        result.algorithm_used = 'AC'
-                        results.append(result)
-                        
             except Exception as e:
-                failed_extractions += 1
+                failed_extractions += len(group)
                 print(f"⚠️ Error: {resume.id}: {e}")
                 continue
         
         print(f"📊 AC: {successful_extractions} success, {failed_extractions} failed")
-        return results
-
-    def _get_unfound_keywords(self, results, original_keywords):
-        """Get keywords not found in exact search"""
-        found_keywords = set()
-        
-        for result in results:
-            for keyword in result.matched_keywords:
-                clean_keyword = keyword.replace(' (fuzzy)', '')
-                found_keywords.add(clean_keyword)
-        
-        unfound = [kw for kw in original_keywords if kw not in found_keywords]
-        return unfound
-
-    def _calculate_relevance_scores(self, results, keywords):
-        """Calculate relevance scores"""
-        for result in results:
-            # Base score from matches
-            base_score = result.total_matches
-            
-            # Keyword coverage bonus
-            coverage_ratio = len(result.matched_keywords) / len(keywords)
-            coverage_bonus = coverage_ratio * 20
-            
-            # Algorithm bonus
-            algo_bonus = 10 if result.algorithm_used in ['KMP', 'BM'] else 5
-            
-            result.relevance_score = base_score + coverage_bonus + algo_bonus
-        
-        return results
+        return collector.results()
 
     def _generate_timing_summary(self):
         """Generate timing summary"""
@@ -378,6 +922,11 @@ class SearchController:
                 avg_time = stats['total_time'] / stats['searches']
                 summary_parts.append(f"{algo}: {avg_time:.3f}s")
         
+        lookups = self.result_cache.hits + self.result_cache.misses
+        if lookups:
+            summary_parts.append(f"Cache: {self.result_cache.hits}/{lookups} hits "
+                                 f"({self.result_cache.hits / lookups:.0%})")
+        
         return " | ".join(summary_parts) if summary_parts else "No timing data"
 
     def get_performance_stats(self):
@@ -15,6 +15,20 @@ class Resume:
     birthdate: Optional[date] = None
     address: Optional[str] = None
 
+@dataclass
+class ResumeFilter:
+    """Resume filters pushed down into the SQL query"""
+    categories: List[str] = None
+    birthdate_from: Optional[date] = None
+    birthdate_to: Optional[date] = None
+    
+    def __post_init__(self):
+        if self.categories is None:
+            self.categories = []
+    
+    def is_empty(self) -> bool:
+        return not self.categories and self.birthdate_from is None and self.birthdate_to is None
+
 @dataclass
 class SearchResult:
     """Search result model"""
@@ -12,7 +12,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.dirname(current_dir))
 
 from utils.database_util import DatabaseUtil
-from database.models import Resume
+from database.models import Resume, ResumeFilter
 from utils.encryption import Encryption
 
 class ResumeRepository:
@@ -25,14 +25,35 @@ class ResumeRepository:
     
     def get_all_resumes(self) -> List[Resume]:
         """Get all resumes with optional decryption"""
+        return self.get_resumes()
+    
+    def get_resumes(self, filters: Optional[ResumeFilter] = None) -> List[Resume]:
+        """Get resumes matching filters with optional decryption"""
         conn = self.db_util.get_connection()
         if not conn:
             return []
         
+        # Filters run in MySQL so only matching rows are fetched
+        conditions = []
+        params = []
+        if filters is not None:
+            if filters.categories:
+                # Same expression and case folding as Resume.category and the query filter
+                conditions.append(f"LOWER(COALESCE(ad.application_role, 'Unknown')) IN "
+                                  f"({', '.join(['%s'] * len(filters.categories))})")
+                params.extend(category.lower() for category in filters.categories)
+            if filters.birthdate_from is not None:
+                conditions.append("ap.date_of_birth >= %s")
+                params.append(filters.birthdate_from)
+            if filters.birthdate_to is not None:
+                conditions.append("ap.date_of_birth <= %s")
+                params.append(filters.birthdate_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
         try:
             cursor = conn.cursor(dictionary=True)
             
-            query = """
+            query = f"""
                 SELECT 
                     CONCAT('CV', LPAD(ad.detail_id, 6, '0')) as id,
                     COALESCE(ad.application_role, 'Unknown') as category,
@@ -48,11 +69,12 @@ class ResumeRepository:
                     ap.last_name
                 FROM ApplicationDetail ad
                 LEFT JOIN ApplicantProfile ap ON ad.applicant_id = ap.applicant_id
+                {where}
                 ORDER BY ad.detail_id
                 LIMIT 1000
             """
             
-            cursor.execute(query)
+            cursor.execute(query, tuple(params))
             results = cursor.fetchall()
             
             resumes = []
@@ -263,6 +285,35 @@ class ResumeRepository:
         finally:
             self.db_util.close_connection(conn)
     
+    def get_all_cv_paths(self) -> List[str]:
+        """Get every distinct CV path"""
+        conn = self.db_util.get_connection()
+        if not conn:
+            return []
+        
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT DISTINCT cv_path
+                FROM ApplicationDetail
+                WHERE cv_path IS NOT NULL
+                ORDER BY cv_path
+            """
+            
+            cursor.execute(query)
+            results = cursor.fetchall()
+            cv_paths = [row[0].replace('\\', '/') for row in results if row[0]]
+            
+            cursor.close()
+            return cv_paths
+            
+        except Error as e:
+            print(f"Error fetching cv paths: {e}")
+            return []
+        finally:
+            self.db_util.close_connection(conn)
+    
     def get_categories(self) -> List[str]:
         """Get all categories"""
         conn = self.db_util.get_connection()
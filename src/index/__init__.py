@@ -0,0 +1,23 @@
+# Index package for ATS CV Search Application
+"""
+This package contains search indexes built over extracted CV text:
+- Inverted index (term -> positional posting lists)
+- Trigram index (substring candidate pruning)
+- Base + delta segments with tombstones and compaction
+- Ranking functions (match counts, BM25 over index statistics)
+"""
+
+from .postings import PostingList, intersect_postings
+from .inverted import InvertedIndex, build_inverted_index, load_inverted_index
+from .trigram import TrigramIndex, build_trigram_index, load_trigram_index
+from .segments import SegmentedIndex, load_indexes
+from .maintenance import IndexMaintainer
+from .ranking import RANKINGS, MatchCountRanking, BM25Ranking
+
+__all__ = [
+    'PostingList', 'intersect_postings',
+    'InvertedIndex', 'build_inverted_index', 'load_inverted_index',
+    'TrigramIndex', 'build_trigram_index', 'load_trigram_index',
+    'SegmentedIndex', 'load_indexes', 'IndexMaintainer',
+    'RANKINGS', 'MatchCountRanking', 'BM25Ranking'
+]
@@ -0,0 +1,209 @@
+"""Positional inverted index over extracted CV text"""
+
+import re
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.text_store import get_cache_dir
+from index.storage import save_index, load_index
+from index.postings import PostingList
+
+TOKEN_RE = re.compile(r'\w+')
+WORD_RE = re.compile(r'^\w+$')
+
+INDEX_FORMAT = 3
+
+def get_index_path() -> Path:
+    """Get inverted index file path in the cache directory"""
+    return get_cache_dir() / 'inverted.idx'
+
+def count_overlapping(pattern: str, text: str) -> int:
+    """Count occurrences of pattern in text, overlaps included (same as KMP)"""
+    count = 0
+    position = text.find(pattern)
+    while position >= 0:
+        count += 1
+        position = text.find(pattern, position + 1)
+    return count
+
+class InvertedIndex:
+    """Term -> posting list index keyed by content hash"""
+    
+    def __init__(self, version: str = ''):
+        self.version = version
+        self.doc_keys: List[str] = []
+        self.doc_ids: Dict[str, int] = {}
+        self.doc_chars = array('I')
+        self.doc_tokens = array('I')
+        self.postings: Dict[str, PostingList] = {}
+        self.term_grams: Optional[Dict[str, Set[str]]] = None  # Trigram -> terms, built on first use
+    
+    def __getstate__(self):
+        # The term trigram map is rebuilt after loading rather than stored
+        state = self.__dict__.copy()
+        state['term_grams'] = None
+        return state
+    
+    def add_document(self, content_hash: str, text: str) -> int:
+        """Tokenize and index one document, returns its doc id"""
+        if content_hash in self.doc_ids:
+            return self.doc_ids[content_hash]
+        
+        doc_id = len(self.doc_keys)
+        self.doc_keys.append(content_hash)
+        self.doc_ids[content_hash] = doc_id
+        
+        # Same folding as the KMP/BM scan
+        text_lower = text.lower()
+        self.doc_chars.append(len(text_lower.strip()))
+        
+        term_positions: Dict[str, List[int]] = {}
+        position = -1
+        for position, match in enumerate(TOKEN_RE.finditer(text_lower)):
+            term_positions.setdefault(match.group(), []).append(position)
+        self.doc_tokens.append(position + 1)
+        
+        for term, positions in term_positions.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = PostingList()
+                self.term_grams = None
+            posting.append(doc_id, positions)
+        
+        return doc_id
+    
+    def __len__(self) -> int:
+        return len(self.doc_keys)
+    
+    def doc_id(self, content_hash: Optional[str]) -> Optional[int]:
+        """Get doc id for a content hash"""
+        return self.doc_ids.get(content_hash) if content_hash else None
+    
+    def average_doc_tokens(self) -> float:
+        """Mean token count per document"""
+        return sum(self.doc_tokens) / len(self.doc_tokens) if self.doc_tokens else 0.0
+    
+    @staticmethod
+    def is_word_query(keyword: str) -> bool:
+        """Word-only keywords are answered from postings alone"""
+        return bool(WORD_RE.match(keyword.lower()))
+    
+    def terms_containing(self, fragment: str) -> List[str]:
+        """Vocabulary terms containing fragment, looked up through the term trigram map"""
+        if len(fragment) < 3:
+            # Too short for a trigram, scan the vocabulary
+            return [term for term in self.postings if fragment in term]
+        
+        if self.term_grams is None:
+            self.term_grams = {}
+            for term in self.postings:
+                for i in range(len(term) - 2):
+                    self.term_grams.setdefault(term[i:i + 3], set()).add(term)
+        
+        # Verify only the terms sharing the fragment's rarest trigram
+        rarest = min((self.term_grams.get(fragment[i:i + 3], ()) for i in range(len(fragment) - 2)), key=len)
+        return [term for term in rarest if fragment in term]
+    
+    def count_occurrences(self, keyword: str, docs: Optional[List[int]] = None) -> Dict[int, int]:
+        """Exact substring counts per doc for a word-only keyword, restricted to sorted docs if given"""
+        # A word-only keyword never spans a non-word character, so every
+        # occurrence lies inside one token: count = sum of tf x occurrences
+        pattern = keyword.lower()
+        counts: Dict[int, int] = {}
+        
+        for term in self.terms_containing(pattern):
+            posting = self.postings[term]
+            occurrences = count_overlapping(pattern, term)
+            # A small partition seeks through skip pointers instead of decoding every doc
+            items = posting.items() if docs is None else posting.intersect_items(docs)
+            for doc_id, tf in items:
+                counts[doc_id] = counts.get(doc_id, 0) + tf * occurrences
+        
+        return counts
+    
+    def candidates(self, keyword: str, docs: Optional[List[int]] = None) -> Optional[Set[int]]:
+        """Docs that may contain keyword via positional intersection, None when it cannot prune"""
+        bounds = self.candidate_bounds(keyword, docs)
+        return set(bounds) if bounds is not None else None
+    
+    def candidate_bounds(self, keyword: str, docs: Optional[List[int]] = None) -> Optional[Dict[int, int]]:
+        """Candidate docs with an upper bound on keyword occurrences, None when it cannot prune
+        
+        docs restricts the result to a partition of doc ids.
+        """
+        pattern = keyword.lower()
+        tokens = list(TOKEN_RE.finditer(pattern))
+        if not tokens:
+            return None
+        
+        # Each keyword token must match consecutive text tokens; a token next
+        # to a non-word character in the keyword is anchored on that side
+        token_terms = []
+        for token in tokens:
+            term = token.group()
+            left = token.start() > 0
+            right = token.end() < len(pattern)
+            if left and right:
+                token_terms.append([term] if term in self.postings else [])
+            elif left:
+                token_terms.append([t for t in self.terms_containing(term) if t.startswith(term)])
+            elif right:
+                token_terms.append([t for t in self.terms_containing(term) if t.endswith(term)])
+            else:
+                token_terms.append(self.terms_containing(term))
+        
+        # Doc -> positions for every keyword token, decoded only for docs in the partition
+        token_positions: List[Dict[int, Set[int]]] = []
+        for terms in token_terms:
+            doc_positions: Dict[int, Set[int]] = {}
+            for term in terms:
+                posting = self.postings[term]
+                items = posting.iter_positions() if docs is None else posting.intersect_positions(docs)
+                for doc_id, positions in items:
+                    doc_positions.setdefault(doc_id, set()).update(positions)
+            if not doc_positions:
+                return {}
+            token_positions.append(doc_positions)
+        
+        matched = set(token_positions[0])
+        for doc_positions in token_positions[1:]:
+            matched &= doc_positions.keys()
+        
+        # Keep docs where the tokens line up at consecutive positions; every
+        # token is anchored on some side, so each start holds at most one match
+        bounds = {}
+        for doc_id in matched:
+            starts = token_positions[0][doc_id]
+            for offset, doc_positions in enumerate(token_positions[1:], 1):
+                starts = {start for start in starts if start + offset in doc_positions[doc_id]}
+                if not starts:
+                    break
+            if starts:
+                bounds[doc_id] = len(starts)
+        
+        return bounds
+    
+    def get_stats(self) -> dict:
+        """Get index statistics"""
+        return {
+            'documents': len(self.doc_keys),
+            'terms': len(self.postings),
+            'postings': sum(len(posting) for posting in self.postings.values()),
+            'positions': sum(posting.position_count for posting in self.postings.values()),
+            'bytes': sum(posting.nbytes() for posting in self.postings.values())
+        }
+    
+    def save(self, path: Optional[Path] = None):
+        """Persist index to the cache directory"""
+        save_index(self, INDEX_FORMAT, path or get_index_path())
+
+def build_inverted_index(texts: Iterable[Tuple[str, str]], version: str = '') -> InvertedIndex:
+    """Build index from (content_hash, text) pairs"""
+    index = InvertedIndex(version)
+    for content_hash, text in sorted(texts):
+        index.add_document(content_hash, text)
+    return index
+
+def load_inverted_index(version: str, path: Optional[Path] = None) -> Optional[InvertedIndex]:
+    """Load persisted index if it exists and matches the extractor version"""
+    return load_index(INDEX_FORMAT, version, path or get_index_path())
@@ -0,0 +1,252 @@
+"""Incremental index maintenance: delta segments, tombstones and compaction"""
+
+import time
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.packed_corpus import write_packed_corpus
+from index.inverted import build_inverted_index
+from index.trigram import build_trigram_index
+from index.segments import (
+    Segment, get_segments_dir, read_manifest, write_manifest, write_segment,
+    empty_manifest, indexed_keys, index_stamp
+)
+
+class IndexMaintainer:
+    """Keeps the packed corpus, inverted and trigram indexes in step with the CV set"""
+    
+    def __init__(self, pdf_extractor, max_segments: int = 8, max_tombstone_ratio: float = 0.2,
+                 flush_delay: float = 5.0):
+        self.pdf_extractor = pdf_extractor
+        self.version = pdf_extractor.text_store.version
+        self.max_segments = max_segments
+        self.max_tombstone_ratio = max_tombstone_ratio
+        self.lock = threading.Lock()
+        self.compaction_thread = None
+        self.logger = logging.getLogger(__name__)
+        
+        # Indexed keys stay in memory until another process changes the segments
+        self.keys = None
+        self.keys_stamp = None
+        
+        # Texts queued by searches, written together by a background thread
+        self.flush_delay = flush_delay
+        self.pending: Dict[str, str] = {}
+        self.pending_lock = threading.Lock()
+        self.flush_thread = None
+    
+    def _indexed_keys(self) -> Tuple[Optional[Set[str]], dict]:
+        """All indexed content hashes (tombstoned included) and the manifest, None without a base"""
+        manifest = read_manifest(self.version)
+        stamp = index_stamp()
+        if stamp != self.keys_stamp:
+            self.keys = indexed_keys(self.version)
+            self.keys_stamp = stamp
+        return self.keys, manifest
+    
+    def add_documents(self, texts: Iterable[Tuple[str, str]], wait: bool = True) -> int:
+        """Index (content_hash, text) pairs into a new delta segment, returns documents added"""
+        if not self.lock.acquire(blocking=wait):
+            # Compaction running, documents are picked up by a later call
+            return 0
+        
+        try:
+            indexed, manifest = self._indexed_keys()
+            if indexed is None:
+                return 0
+            return self._add_segment(dict(texts), indexed, manifest, set())
+        finally:
+            self.lock.release()
+    
+    def _add_segment(self, texts: Dict[str, str], indexed: Set[str], manifest: dict,
+                     removed: Set[str]) -> int:
+        """Write delta segment for new texts and update tombstones"""
+        tombstones = set(manifest['tombstones'])
+        revived = tombstones & texts.keys()
+        new_texts = [(content_hash, text) for content_hash, text in texts.items()
+                     if content_hash not in indexed and text]
+        
+        if not new_texts and not revived and not (removed - tombstones):
+            return 0
+        
+        if new_texts:
+            segment = Segment(
+                self.version,
+                build_inverted_index(new_texts, self.version),
+                build_trigram_index(new_texts, self.version)
+            )
+            manifest['segments'].append(write_segment(segment))
+        
+        manifest['tombstones'] = sorted((tombstones - revived) | removed)
+        write_manifest(manifest)
+        # Own write, the in-memory keys stay valid
+        indexed.update(content_hash for content_hash, _ in new_texts)
+        self.keys_stamp = index_stamp()
+        return len(new_texts)
+    
+    def sync(self, cv_paths: List[str], rebuild: bool = False, progress_callback=None) -> dict:
+        """Bring indexes in line with cv_paths: add new texts, tombstone dropped ones"""
+        start_time = time.time()
+        
+        with self.lock:
+            hashes = {cv_path: self.pdf_extractor.content_hash(cv_path) for cv_path in cv_paths}
+            live = {content_hash for content_hash in hashes.values() if content_hash}
+            indexed, manifest = self._indexed_keys()
+            
+            if rebuild or indexed is None:
+                stats = self._compact(live)
+                stats['mode'] = 'rebuild'
+                stats['elapsed'] = time.time() - start_time
+                return stats
+            
+            # Extract only contents the index has never seen
+            new_paths = {}
+            for cv_path, content_hash in hashes.items():
+                if content_hash and content_hash not in indexed:
+                    new_paths.setdefault(content_hash, cv_path)
+            extracted = self.pdf_extractor.extract_many(
+                list(new_paths.values()),
+                workers=1 if len(new_paths) < 4 else None,
+                progress_callback=progress_callback
+            )
+            texts = {content_hash: extracted.get(cv_path) for content_hash, cv_path in new_paths.items()}
+            # Tombstoned contents referenced again are revived without re-indexing
+            texts.update({content_hash: None for content_hash in live & set(manifest['tombstones'])})
+            
+            removed = indexed - live
+            newly_removed = removed - set(manifest['tombstones'])
+            added = self._add_segment(texts, indexed, manifest, removed)
+            
+            stats = {
+                'mode': 'incremental',
+                'added': added,
+                'removed': len(newly_removed),
+                'segments': len(manifest['segments']),
+                'tombstones': len(manifest['tombstones'])
+            }
+            
+            if self._needs_compaction(manifest, len(indexed)):
+                stats.update(self._compact(live))
+                stats['mode'] = 'incremental+compaction'
+        
+        stats['elapsed'] = time.time() - start_time
+        return stats
+    
+    def _needs_compaction(self, manifest: dict, indexed_count: int) -> bool:
+        """Too many delta segments or too many tombstoned documents"""
+        if len(manifest['segments']) > self.max_segments:
+            return True
+        return indexed_count > 0 and len(manifest['tombstones']) / indexed_count > self.max_tombstone_ratio
+    
+    def needs_compaction(self) -> bool:
+        """Check compaction thresholds against the current manifest"""
+        with self.lock:
+            return self._needs_compaction_locked()
+    
+    def _needs_compaction_locked(self) -> bool:
+        """Compaction thresholds check; caller holds the lock"""
+        indexed, manifest = self._indexed_keys()
+        return indexed is not None and self._needs_compaction(manifest, len(indexed))
+    
+    def compact(self, live: Optional[Set[str]] = None) -> dict:
+        """Fold delta segments into a new base and drop tombstoned documents"""
+        with self.lock:
+            return self._compact(live)
+    
+    def _compact(self, live: Optional[Set[str]] = None) -> dict:
+        """Rebuild base from stored texts; caller holds the lock"""
+        start_time = time.time()
+        manifest = read_manifest(self.version)
+        
+        if live is None:
+            indexed, _ = self._indexed_keys()
+            live = (indexed or set()) - set(manifest['tombstones'])
+        
+        texts = [(content_hash, text) for content_hash, text in self.pdf_extractor.text_store.iter_texts()
+                 if content_hash in live]
+        
+        doc_count, blob_bytes = write_packed_corpus(texts, self.version)
+        inverted = build_inverted_index(texts, self.version)
+        inverted.save()
+        trigram = build_trigram_index(texts, self.version)
+        trigram.save()
+        
+        # Base now holds every document, drop the deltas
+        write_manifest(empty_manifest(self.version))
+        for name in manifest['segments']:
+            try:
+                (get_segments_dir() / name).unlink()
+            except OSError:
+                pass
+        self.keys = {content_hash for content_hash, _ in texts}
+        self.keys_stamp = index_stamp()
+        
+        inverted_stats = inverted.get_stats()
+        trigram_stats = trigram.get_stats()
+        return {
+            'documents': doc_count,
+            'blob_bytes': blob_bytes,
+            'terms': inverted_stats['terms'],
+            'postings': inverted_stats['postings'],
+            'trigrams': trigram_stats['trigrams'],
+            'compaction_time': time.time() - start_time
+        }
+    
+    def compact_in_background(self) -> bool:
+        """Start compaction in a daemon thread, False if one is already running"""
+        if self.compaction_thread is not None and self.compaction_thread.is_alive():
+            return False
+        
+        def run():
+            try:
+                stats = self.compact()
+                self.logger.info(f"Index compaction: {stats['documents']} docs in {stats['compaction_time']:.2f}s")
+            except Exception as e:
+                self.logger.warning(f"Index compaction failed: {e}")
+        
+        self.compaction_thread = threading.Thread(target=run, daemon=True)
+        self.compaction_thread.start()
+        return True
+    
+    def queue_documents(self, texts: Iterable[Tuple[str, str]]) -> int:
+        """Queue (content_hash, text) pairs for a delta segment written in the background, returns newly queued"""
+        with self.pending_lock:
+            queued = [(content_hash, text) for content_hash, text in texts if content_hash not in self.pending]
+            self.pending.update(queued)
+            
+            if self.pending and self.flush_thread is None:
+                self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+                self.flush_thread.start()
+        
+        return len(queued)
+    
+    def _flush_loop(self):
+        """Write queued texts after a delay so consecutive searches share one segment"""
+        while True:
+            time.sleep(self.flush_delay)
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.warning(f"Delta segment write failed: {e}")
+            
+            with self.pending_lock:
+                if not self.pending:
+                    self.flush_thread = None
+                    return
+    
+    def flush(self) -> int:
+        """Write queued texts into one delta segment now and compact if needed, returns documents added"""
+        with self.pending_lock:
+            texts, self.pending = self.pending, {}
+        if not texts:
+            return 0
+        
+        # Waits for a running compaction, the queued texts are not in its base
+        added = self.add_documents(texts.items())
+        if added:
+            self.logger.info(f"Indexed {added} new CVs into a delta segment")
+        
+        if self.needs_compaction():
+            self.compact_in_background()
+        return added
+
@@ -0,0 +1,348 @@
+"""Delta + varint compressed posting lists with skip pointers"""
+
+import time
+import random
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+BLOCK_SIZE = 64
+SEEK_RATIO = 16  # Seek with skip pointers when this list is this many times longer than the targets
+
+def encode_varint(value: int, out: bytearray):
+    """Append non-negative int as LEB128 varint (7 bits per byte, high bit = more)"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(data, pos: int) -> Tuple[int, int]:
+    """Decode one varint at pos, returns (value, next pos)"""
+    byte = data[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+    
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def skip_varints(data, pos: int, count: int) -> int:
+    """Position just past the next count varints, without decoding them"""
+    while count:
+        if data[pos] < 0x80:
+            count -= 1
+        pos += 1
+    return pos
+
+def iter_varints(data) -> Iterator[int]:
+    """Decode consecutive varints"""
+    value = 0
+    shift = 0
+    for byte in data:
+        if byte < 0x80:
+            yield value | (byte << shift)
+            value = 0
+            shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+
+class PostingList:
+    """Increasing doc ids, optionally with token positions, as delta + varint bytes
+    
+    Doc stream holds (doc gap - 1, tf) per doc, tf only for positional lists.
+    Positions are gaps within each doc in a separate stream so doc-only scans
+    never decode them. Every BLOCK_SIZE docs a skip entry stores the last doc id
+    and doc/position byte offsets before the block, letting intersections jump
+    whole blocks.
+    """
+    
+    __slots__ = ('count', 'last_doc', 'docs', 'positions', 'position_count', 'skip_docs', 'skip_offsets',
+                 'skip_positions')
+    
+    def __init__(self, positional: bool = True):
+        self.count = 0
+        self.last_doc = -1
+        self.docs = bytearray()
+        self.positions = bytearray() if positional else None
+        self.position_count = 0
+        self.skip_docs = None
+        self.skip_offsets = None
+        self.skip_positions = None
+    
+    def append(self, doc_id: int, positions: Optional[List[int]] = None):
+        """Add a document, doc ids must be appended in increasing order"""
+        if self.count and self.count % BLOCK_SIZE == 0:
+            if self.skip_docs is None:
+                self.skip_docs = array('I')
+                self.skip_offsets = array('I')
+                if self.positions is not None:
+                    self.skip_positions = array('I')
+            self.skip_docs.append(self.last_doc)
+            self.skip_offsets.append(len(self.docs))
+            if self.positions is not None:
+                self.skip_positions.append(len(self.positions))
+        
+        encode_varint(doc_id - self.last_doc - 1, self.docs)
+        if self.positions is not None:
+            encode_varint(len(positions), self.docs)
+            previous = 0
+            for position in positions:
+                encode_varint(position - previous, self.positions)
+                previous = position
+            self.position_count += len(positions)
+        
+        self.last_doc = doc_id
+        self.count += 1
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __iter__(self) -> Iterator[int]:
+        """Decode doc ids"""
+        if self.positions is None:
+            doc_id = -1
+            for gap in iter_varints(self.docs):
+                doc_id += gap + 1
+                yield doc_id
+        else:
+            for doc_id, _ in self.items():
+                yield doc_id
+    
+    def items(self) -> Iterator[Tuple[int, int]]:
+        """Decode (doc id, term frequency) pairs"""
+        if self.positions is None:
+            for doc_id in self:
+                yield doc_id, 1
+            return
+        
+        values = iter_varints(self.docs)
+        doc_id = -1
+        for gap, tf in zip(values, values):
+            doc_id += gap + 1
+            yield doc_id, tf
+    
+    def iter_positions(self) -> Iterator[Tuple[int, List[int]]]:
+        """Decode (doc id, token positions) pairs"""
+        positions = iter_varints(self.positions)
+        for doc_id, tf in self.items():
+            position = 0
+            doc_positions = []
+            for _ in range(tf):
+                position += next(positions)
+                doc_positions.append(position)
+            yield doc_id, doc_positions
+    
+    def intersect(self, doc_ids: Iterable[int]) -> List[int]:
+        """Doc ids (increasing) that are also in this list, skipping blocks via skip pointers"""
+        return [doc_id for doc_id, _ in self.intersect_items(doc_ids)]
+    
+    def intersect_items(self, doc_ids: Iterable[int]) -> List[Tuple[int, int]]:
+        """(doc id, term frequency) for increasing doc ids also in this list"""
+        if not isinstance(doc_ids, (list, array)):
+            doc_ids = list(doc_ids)
+        if self.skip_docs is None or len(doc_ids) * SEEK_RATIO > self.count:
+            # Dense targets touch most blocks anyway, decode linearly
+            targets = set(doc_ids)
+            return [(doc_id, tf) for doc_id, tf in self.items() if doc_id in targets]
+        
+        data = self.docs
+        positional = self.positions is not None
+        skip_docs = self.skip_docs
+        matches = []
+        doc_id = -1
+        index = 0
+        pos = 0
+        
+        for target in doc_ids:
+            if doc_id < target and skip_docs is not None:
+                # Jump to the last block starting before target
+                block = bisect_left(skip_docs, target)
+                if block > index // BLOCK_SIZE:
+                    doc_id = skip_docs[block - 1]
+                    pos = self.skip_offsets[block - 1]
+                    index = block * BLOCK_SIZE
+            
+            while doc_id < target:
+                if index >= self.count:
+                    return matches
+                gap, pos = decode_varint(data, pos)
+                if positional:
+                    tf, pos = decode_varint(data, pos)
+                doc_id += gap + 1
+                index += 1
+            
+            if doc_id == target:
+                matches.append((target, tf if positional else 1))
+        
+        return matches
+    
+    def intersect_positions(self, doc_ids: Iterable[int]) -> List[Tuple[int, List[int]]]:
+        """(doc id, token positions) for increasing doc ids also in this list
+        
+        Positions of other docs are skipped without decoding, whole blocks via skip pointers.
+        """
+        if not isinstance(doc_ids, (list, array)):
+            doc_ids = list(doc_ids)
+        data = self.docs
+        positions = self.positions
+        skip_docs = self.skip_docs
+        seek = skip_docs is not None and len(doc_ids) * SEEK_RATIO <= self.count
+        matches = []
+        doc_id = -1
+        index = 0
+        pos = 0
+        position_pos = 0
+        pending = 0  # Positions of the current doc not consumed yet
+        
+        for target in doc_ids:
+            if seek and doc_id < target:
+                block = bisect_left(skip_docs, target)
+                if block > index // BLOCK_SIZE:
+                    doc_id = skip_docs[block - 1]
+                    pos = self.skip_offsets[block - 1]
+                    position_pos = self.skip_positions[block - 1]
+                    index = block * BLOCK_SIZE
+                    pending = 0
+            
+            while doc_id < target:
+                if index >= self.count:
+                    return matches
+                position_pos = skip_varints(positions, position_pos, pending)
+                gap, pos = decode_varint(data, pos)
+                pending, pos = decode_varint(data, pos)
+                doc_id += gap + 1
+                index += 1
+            
+            if doc_id == target:
+                position = 0
+                doc_positions = []
+                for _ in range(pending):
+                    gap, position_pos = decode_varint(positions, position_pos)
+                    position += gap
+                    doc_positions.append(position)
+                pending = 0
+                matches.append((target, doc_positions))
+        
+        return matches
+    
+    def nbytes(self) -> int:
+        """Encoded size in bytes"""
+        size = len(self.docs) + (len(self.positions) if self.positions is not None else 0)
+        if self.skip_docs is not None:
+            size += (len(self.skip_docs) + len(self.skip_offsets)) * self.skip_docs.itemsize
+        if self.skip_positions is not None:
+            size += len(self.skip_positions) * self.skip_positions.itemsize
+        return size
+    
+    def __getstate__(self):
+        positions = bytes(self.positions) if self.positions is not None else None
+        return (self.count, self.last_doc, bytes(self.docs), positions,
+                self.position_count, self.skip_docs, self.skip_offsets, self.skip_positions)
+    
+    def __setstate__(self, state):
+        (self.count, self.last_doc, self.docs, self.positions,
+         self.position_count, self.skip_docs, self.skip_offsets, self.skip_positions) = state
+
+def intersect_postings(postings: List[PostingList]) -> List[int]:
+    """Doc ids present in every posting list, shortest list drives the intersection"""
+    if not postings:
+        return []
+    
+    postings = sorted(postings, key=len)
+    doc_ids = list(postings[0])
+    for posting in postings[1:]:
+        doc_ids = posting.intersect(doc_ids)
+        if not doc_ids:
+            break
+    return doc_ids
+
+def test_postings():
+    """Test encode/decode round trip and intersections against plain sets"""
+    print("🧪 Testing compressed posting lists...")
+    
+    rng = random.Random(7)
+    for size in (1, 63, 64, 65, 500, 5000):
+        doc_ids = sorted(rng.sample(range(size * 20), size))
+        positions = [sorted(rng.sample(range(1000), rng.randint(1, 5))) for _ in doc_ids]
+        posting = PostingList()
+        for doc_id, doc_positions in zip(doc_ids, positions):
+            posting.append(doc_id, doc_positions)
+        
+        assert list(posting) == doc_ids
+        assert list(posting.iter_positions()) == list(zip(doc_ids, positions))
+        
+        other = sorted(rng.sample(range(size * 20), size))
+        assert posting.intersect(other) == sorted(set(doc_ids) & set(other))
+        sparse = doc_ids[::SEEK_RATIO * 4]
+        assert posting.intersect_items(sparse) == [(doc_id, len(positions[doc_ids.index(doc_id)])) for doc_id in sparse]
+        expected = dict(zip(doc_ids, positions))
+        for targets in (sparse, other, doc_ids):
+            assert posting.intersect_positions(targets) == [(doc_id, expected[doc_id]) for doc_id in targets
+                                                             if doc_id in expected]
+        print(f"   ✅ {size} docs round trip and intersection")
+    
+    assert decode_varint(bytes([0xAC, 0x02]), 0) == (300, 2)
+
+def benchmark_postings(doc_count: int = 100000, lists: int = 20):
+    """Compare bytes/posting and intersection throughput against uncompressed arrays"""
+    print(f"\n⏱️ Posting list benchmark ({lists} lists over {doc_count} docs)")
+    
+    rng = random.Random(42)
+    raw_lists = []
+    for i in range(lists):
+        density = 0.5 / (i + 1) ** 2
+        raw_lists.append(sorted(rng.sample(range(doc_count), int(doc_count * density))))
+    
+    plain = [array('I', doc_ids) for doc_ids in raw_lists]
+    compressed = []
+    for doc_ids in raw_lists:
+        posting = PostingList(positional=False)
+        for doc_id in doc_ids:
+            posting.append(doc_id)
+        compressed.append(posting)
+    
+    total = sum(len(doc_ids) for doc_ids in raw_lists)
+    list_bytes = sum(8 * len(doc_ids) + 28 * len(doc_ids) for doc_ids in raw_lists)
+    print(f"   Python list: {list_bytes / total:.2f} bytes/posting")
+    print(f"   array('I'):  {sum(len(a) * a.itemsize for a in plain) / total:.2f} bytes/posting")
+    print(f"   varint:      {sum(p.nbytes() for p in compressed) / total:.2f} bytes/posting")
+    
+    # Similar-length pairs vs a short list against a long one
+    long_lists = range(lists // 4)
+    short_lists = range(lists - 4, lists)
+    pair_sets = {
+        'similar': [(i, i + 1) for i in range(lists - 1)] * 10,
+        'skewed': [(a, b) for a in long_lists for b in short_lists] * 10
+    }
+    
+    for name, pairs in pair_sets.items():
+        start_time = time.time()
+        for a, b in pairs:
+            set(plain[a]).intersection(plain[b])
+        plain_time = time.time() - start_time
+        
+        start_time = time.time()
+        for a, b in pairs:
+            targets = set(compressed[b])
+            [doc_id for doc_id in compressed[a] if doc_id in targets]
+        decode_time = time.time() - start_time
+        
+        start_time = time.time()
+        for a, b in pairs:
+            intersect_postings([compressed[a], compressed[b]])
+        compressed_time = time.time() - start_time
+        
+        print(f"   {name} intersections/s: set of arrays {len(pairs) / plain_time:.0f}, "
+              f"full decode {len(pairs) / decode_time:.0f}, skip pointers {len(pairs) / compressed_time:.0f}")
+
+if __name__ == "__main__":
+    test_postings()
+    benchmark_postings()
@@ -0,0 +1,111 @@
+"""Relevance ranking functions for search results"""
+
+import math
+from typing import Dict, List, Optional
+
+RANKINGS = ('MATCHES', 'BM25')
+
+def clean_keyword(keyword: str) -> str:
+    """Strip the fuzzy marker from a matched keyword"""
+    return keyword.replace(' (fuzzy)', '')
+
+def document_frequency(index, keyword: str) -> int:
+    """Number of indexed docs containing keyword (phrase keywords use positional candidates)"""
+    if index.is_word_query(keyword):
+        return len(index.count_occurrences(keyword))
+    
+    bounds = index.candidate_bounds(keyword)
+    return len(index) if bounds is None else len(bounds)
+
+class MatchCountRanking:
+    """Raw match count plus keyword coverage and algorithm bonuses"""
+    
+    name = 'MATCHES'
+    
+    def __init__(self, keywords: List[str]):
+        self.keywords = keywords
+    
+    def score(self, keyword_matches: Dict[str, int], algorithm: str, content_hash: Optional[str] = None) -> float:
+        """Relevance of one document"""
+        total_matches = sum(keyword_matches.values())
+        
+        # Keyword coverage bonus
+        coverage_ratio = len(keyword_matches) / len(self.keywords)
+        coverage_bonus = coverage_ratio * 20
+        
+        # Algorithm bonus
+        algo_bonus = 10 if algorithm in ['KMP', 'BM', 'INDEX'] else 5
+        
+        return total_matches + coverage_bonus + algo_bonus
+
+class BM25Ranking:
+    """Okapi BM25 from index statistics: doc length in tokens and keyword document frequency
+    
+    Keyword idf is computed once per query; scoring a document is a doc length
+    lookup plus one term per matched keyword. Docs not indexed yet are scored
+    at the average length.
+    """
+    
+    name = 'BM25'
+    
+    def __init__(self, index, keywords: List[str], k1: float = 1.2, b: float = 0.75):
+        self.index = index
+        self.k1 = k1
+        self.b = b
+        self.doc_count = len(index)
+        self.average_length = index.average_doc_tokens() or 1.0
+        # Keyed by folded keyword, matching is case-insensitive in every search mode
+        self.idf = {keyword.lower(): self._idf(document_frequency(index, keyword)) for keyword in keywords}
+    
+    def _idf(self, doc_freq: int) -> float:
+        """Non-negative idf, so scores only grow with term frequency"""
+        return math.log(1 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+    
+    def doc_length(self, content_hash: Optional[str]) -> float:
+        """Token count of an indexed doc, average length otherwise"""
+        doc_id = self.index.doc_id(content_hash)
+        return self.index.doc_tokens[doc_id] if doc_id is not None else self.average_length
+    
+    def score(self, keyword_matches: Dict[str, int], algorithm: str, content_hash: Optional[str] = None) -> float:
+        """BM25 of one document over its keyword counts"""
+        length_norm = self.k1 * (1 - self.b + self.b * self.doc_length(content_hash) / self.average_length)
+        
+        score = 0.0
+        for keyword, tf in keyword_matches.items():
+            idf = self.idf.get(clean_keyword(keyword).lower(), 0.0)
+            # Unbounded tf (a score bound) saturates at idf * (k1 + 1)
+            saturation = 1.0 if math.isinf(tf) else tf / (tf + length_norm)
+            score += idf * (self.k1 + 1) * saturation
+        return score
+
+def test_bm25_ranking():
+    """BM25 scores do not depend on how the search path spells matched keywords"""
+    from index.inverted import build_inverted_index
+    
+    print("🧪 Testing BM25 ranking...")
+    texts = [
+        (f'{0:040x}', 'python python sql developer with python experience'),
+        (f'{1:040x}', 'sql reporting analyst, some python'),
+        (f'{2:040x}', 'marketing manager'),
+    ]
+    index = build_inverted_index(texts)
+    ranking = BM25Ranking(index, ['Python', 'SQL'])
+    
+    # KMP/BM/INDEX key matches as typed, AC used to key them folded
+    typed = ranking.score({'Python': 3, 'SQL': 1}, 'KMP', texts[0][0])
+    folded = ranking.score({'python': 3, 'sql': 1}, 'AC', texts[0][0])
+    assert typed > 0 and typed == folded
+    assert ranking.score({'Python (fuzzy)': 1}, 'LEVENSHTEIN') > 0
+    
+    # More matches in a doc of the same length ranks higher
+    weaker = ranking.score({'python': 1, 'sql': 1}, 'AC', texts[1][0])
+    assert 0 < weaker < folded
+    print("   ✅ BM25 scores match for typed and folded keywords")
+
+if __name__ == "__main__":
+    import os
+    import sys
+    
+    # Allow running as a script from the index directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    test_bm25_ranking()
@@ -0,0 +1,196 @@
+"""Base + delta index segments with tombstones
+
+The base segment is the full build (corpus.pack, inverted.idx, trigram.idx).
+Documents added later go into small immutable delta segments listed in a
+manifest, and documents no longer referenced by any CV are tombstoned until
+compaction folds everything back into a new base.
+"""
+
+import os
+import json
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from utils.text_store import get_cache_dir
+from index.storage import save_index, load_index
+from index.inverted import InvertedIndex, get_index_path, load_inverted_index
+from index.trigram import TrigramIndex, get_trigram_path, load_trigram_index
+
+SEGMENT_FORMAT = 3
+
+def get_segments_dir() -> Path:
+    """Get delta segment directory in the cache directory"""
+    return get_cache_dir() / 'segments'
+
+def get_manifest_path() -> Path:
+    """Get segment manifest path"""
+    return get_segments_dir() / 'manifest.json'
+
+class Segment:
+    """Delta segment: inverted and trigram index over a batch of new documents"""
+    
+    def __init__(self, version: str, inverted: InvertedIndex, trigram: TrigramIndex):
+        self.version = version
+        self.inverted = inverted
+        self.trigram = trigram
+
+def empty_manifest(version: str) -> dict:
+    """Manifest with no delta segments and no tombstones"""
+    return {'format': SEGMENT_FORMAT, 'version': version, 'segments': [], 'tombstones': []}
+
+def read_manifest(version: str) -> dict:
+    """Read manifest, empty when missing or written by another extractor version"""
+    try:
+        with open(get_manifest_path(), encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return empty_manifest(version)
+    
+    if manifest.get('format') != SEGMENT_FORMAT or manifest.get('version') != version:
+        return empty_manifest(version)
+    return manifest
+
+def write_manifest(manifest: dict):
+    """Write manifest, written beside the target and swapped in"""
+    path = get_manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+    tmp_path.replace(path)
+
+def write_segment(segment: Segment) -> str:
+    """Persist delta segment, returns its file name"""
+    name = f"delta-{time.time_ns()}-{os.getpid()}.idx"
+    save_index(segment, SEGMENT_FORMAT, get_segments_dir() / name)
+    return name
+
+def load_segment(name: str, version: str) -> Optional[Segment]:
+    """Load delta segment by file name"""
+    return load_index(SEGMENT_FORMAT, version, get_segments_dir() / name)
+
+def index_stamp() -> Tuple:
+    """Modification times that change whenever base or delta segments change"""
+    stamp = []
+    for path in (get_index_path(), get_trigram_path(), get_manifest_path()):
+        try:
+            stamp.append(path.stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+class SegmentedIndex:
+    """Read view over base and delta segments of one index kind; tombstoned docs are hidden"""
+    
+    def __init__(self, segments: List, tombstones: Set[str]):
+        self.segments = segments
+        self.tombstones = tombstones
+        self.version = segments[0].version
+        self.offsets = []
+        self.doc_keys: List[str] = []
+        
+        for segment in segments:
+            self.offsets.append(len(self.doc_keys))
+            self.doc_keys.extend(segment.doc_keys)
+        
+        # Newest segment wins if a document was indexed twice
+        self.doc_ids = {
+            content_hash: doc_id for doc_id, content_hash in enumerate(self.doc_keys)
+            if content_hash not in tombstones
+        }
+        self.live = set(self.doc_ids.values())
+        
+        if hasattr(segments[0], 'doc_chars'):
+            self.doc_chars = array('I')
+            self.doc_tokens = array('I')
+            for segment in segments:
+                self.doc_chars.extend(segment.doc_chars)
+                self.doc_tokens.extend(segment.doc_tokens)
+            self.live_tokens = sum(self.doc_tokens[doc_id] for doc_id in self.live)
+    
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+    
+    def doc_id(self, content_hash: Optional[str]) -> Optional[int]:
+        """Get doc id for a content hash"""
+        return self.doc_ids.get(content_hash) if content_hash else None
+    
+    def average_doc_tokens(self) -> float:
+        """Mean token count of live documents (inverted segments only)"""
+        return self.live_tokens / len(self.live) if self.live else 0.0
+    
+    def is_word_query(self, keyword: str) -> bool:
+        """Word-only keywords are answered from postings alone"""
+        return self.segments[0].is_word_query(keyword)
+    
+    def _local_docs(self, docs: Optional[List[int]]):
+        """Yield (offset, segment, segment-local sorted docs or None) per segment"""
+        ends = self.offsets[1:] + [len(self.doc_keys)]
+        for offset, end, segment in zip(self.offsets, ends, self.segments):
+            if docs is None:
+                yield offset, segment, None
+                continue
+            local = [doc_id - offset for doc_id in docs if offset <= doc_id < end]
+            if local:
+                yield offset, segment, local
+    
+    def count_occurrences(self, keyword: str, docs: Optional[List[int]] = None) -> dict:
+        """Per-doc counts merged across segments, restricted to sorted docs if given"""
+        counts = {}
+        for offset, segment, local in self._local_docs(docs):
+            for doc_id, count in segment.count_occurrences(keyword, local).items():
+                if offset + doc_id in self.live:
+                    counts[offset + doc_id] = count
+        return counts
+    
+    def candidates(self, keyword: str) -> Optional[Set[int]]:
+        """Candidate docs merged across segments, None when any segment cannot prune"""
+        merged = set()
+        for offset, segment in zip(self.offsets, self.segments):
+            candidates = segment.candidates(keyword)
+            if candidates is None:
+                return None
+            merged.update(offset + doc_id for doc_id in candidates if offset + doc_id in self.live)
+        return merged
+    
+    def candidate_bounds(self, keyword: str, docs: Optional[List[int]] = None) -> Optional[Dict[int, int]]:
+        """Per-doc occurrence bounds merged across segments (inverted segments only)"""
+        merged = {}
+        for offset, segment, local in self._local_docs(docs):
+            bounds = segment.candidate_bounds(keyword, local)
+            if bounds is None:
+                return None
+            for doc_id, bound in bounds.items():
+                if offset + doc_id in self.live:
+                    merged[offset + doc_id] = bound
+        return merged
+
+def indexed_keys(version: str) -> Optional[Set[str]]:
+    """Content hashes in base and delta segments (tombstoned included), None without a base"""
+    base = load_trigram_index(version)
+    if base is None:
+        return None
+    
+    keys = set(base.doc_keys)
+    for name in read_manifest(version)['segments']:
+        segment = load_segment(name, version)
+        if segment is not None:
+            keys.update(segment.trigram.doc_keys)
+    return keys
+
+def load_indexes(version: str) -> Tuple[Optional[SegmentedIndex], Optional[SegmentedIndex]]:
+    """Load (inverted, trigram) views over the base and delta segments"""
+    manifest = read_manifest(version)
+    deltas = [load_segment(name, version) for name in manifest['segments']]
+    deltas = [segment for segment in deltas if segment is not None]
+    tombstones = set(manifest['tombstones'])
+    
+    views = []
+    for base, kind in ((load_inverted_index(version), 'inverted'), (load_trigram_index(version), 'trigram')):
+        if base is None:
+            views.append(None)
+            continue
+        views.append(SegmentedIndex([base] + [getattr(segment, kind) for segment in deltas], tombstones))
+    
+    return views[0], views[1]
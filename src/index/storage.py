@@ -0,0 +1,30 @@
+"""Persistence helpers for search indexes"""
+
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+def save_index(index: Any, index_format: int, path: Path):
+    """Pickle index with its format number, written beside the target and swapped in"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as file:
+        pickle.dump((index_format, index), file, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+
+def load_index(index_format: int, version: str, path: Path) -> Optional[Any]:
+    """Load pickled index if it exists and matches format and extractor version"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    
+    try:
+        with open(path, 'rb') as file:
+            stored_format, index = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, TypeError):
+        return None
+    
+    if stored_format != index_format or getattr(index, 'version', None) != version:
+        return None
+    return index
@@ -0,0 +1,91 @@
+"""Character trigram index for substring candidate pruning"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.text_store import get_cache_dir
+from index.storage import save_index, load_index
+from index.postings import PostingList, intersect_postings
+
+TRIGRAM_FORMAT = 3
+GRAM = 3
+
+def get_trigram_path() -> Path:
+    """Get trigram index file path in the cache directory"""
+    return get_cache_dir() / 'trigram.idx'
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct character trigrams of text"""
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+class TrigramIndex:
+    """Trigram -> doc ids index over lowercased text, keyed by content hash"""
+    
+    def __init__(self, version: str = ''):
+        self.version = version
+        self.doc_keys: List[str] = []
+        self.doc_ids: Dict[str, int] = {}
+        self.postings: Dict[str, PostingList] = {}
+    
+    def add_document(self, content_hash: str, text: str) -> int:
+        """Index trigrams of one document, returns its doc id"""
+        if content_hash in self.doc_ids:
+            return self.doc_ids[content_hash]
+        
+        doc_id = len(self.doc_keys)
+        self.doc_keys.append(content_hash)
+        self.doc_ids[content_hash] = doc_id
+        
+        # Same folding as the KMP/BM scan
+        for gram in trigrams(text.lower()):
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = PostingList(positional=False)
+            posting.append(doc_id)
+        
+        return doc_id
+    
+    def __len__(self) -> int:
+        return len(self.doc_keys)
+    
+    def doc_id(self, content_hash: Optional[str]) -> Optional[int]:
+        """Get doc id for a content hash"""
+        return self.doc_ids.get(content_hash) if content_hash else None
+    
+    def candidates(self, keyword: str) -> Optional[Set[int]]:
+        """Docs containing every trigram of keyword, None for keywords shorter than a trigram"""
+        pattern = keyword.lower()
+        if len(pattern) < GRAM:
+            return None
+        
+        postings = []
+        for gram in trigrams(pattern):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return set()
+            postings.append(posting)
+        
+        return set(intersect_postings(postings))
+    
+    def get_stats(self) -> dict:
+        """Get index statistics"""
+        return {
+            'documents': len(self.doc_keys),
+            'trigrams': len(self.postings),
+            'postings': sum(len(posting) for posting in self.postings.values()),
+            'bytes': sum(posting.nbytes() for posting in self.postings.values())
+        }
+    
+    def save(self, path: Optional[Path] = None):
+        """Persist index to the cache directory"""
+        save_index(self, TRIGRAM_FORMAT, path or get_trigram_path())
+
+def build_trigram_index(texts: Iterable[Tuple[str, str]], version: str = '') -> TrigramIndex:
+    """Build index from (content_hash, text) pairs"""
+    index = TrigramIndex(version)
+    for content_hash, text in sorted(texts):
+        index.add_document(content_hash, text)
+    return index
+
+def load_trigram_index(version: str, path: Optional[Path] = None) -> Optional[TrigramIndex]:
+    """Load persisted index if it exists and matches the extractor version"""
+    return load_index(TRIGRAM_FORMAT, version, path or get_trigram_path())
@@ -8,14 +8,17 @@ from ui.results_panel import ResultsPanel
 from ui.summary_view import SummaryView
 from controller.search import SearchController
 from controller.cv import CVController
+from utils.pdf_extractor import get_shared_extractor
 
 class MainWindow(QtWidgets.QMainWindow):
     """Main application window"""
     
     def __init__(self):
         super().__init__()
-        self.search_controller = SearchController()
-        self.cv_controller = CVController()
+        # One extraction cache for search, summaries and previews
+        self.pdf_extractor = get_shared_extractor()
+        self.search_controller = SearchController(pdf_extractor=self.pdf_extractor)
+        self.cv_controller = CVController(pdf_extractor=self.pdf_extractor)
         self.setup_ui()
         self.connect_signals()
     
@@ -116,6 +119,8 @@ class MainWindow(QtWidgets.QMainWindow):
         algorithm = search_params['algorithm']
         top_n = search_params['top_n']
         fuzzy_threshold = search_params['fuzzy_threshold']
+        match_all = search_params.get('match_all', False)
+        query = search_params.get('query')
         
         print(f"🔍 Starting search: {keywords} using {algorithm}")
         
@@ -133,7 +138,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 keywords=keywords,  # This is already a list from search_params
                 algorithm=algorithm,
                 max_results=top_n,
-                fuzzy_threshold=fuzzy_threshold
+                fuzzy_threshold=fuzzy_threshold,
+                match_all=match_all,
+                query=query
             )
             
             # Show results
@@ -231,6 +238,7 @@ Pattern Matching Algorithms:
 • Knuth-Morris-Pratt (KMP)
 • Boyer-Moore (BM) 
 • Aho-Corasick (AC)
+• Inverted Index (INDEX)
 • Levenshtein Distance
 
 Authors: Tim Stima Sukses
@@ -254,6 +262,7 @@ KMP (Knuth-Morris-Pratt):
 Boyer-Moore:
 • Best for: Long keywords (>3 chars)
 • Complexity: O(nm) worst case
+• Runs: Horspool variant (fastest on the bundled CVs), Wu-Manber for several keywords
 • Recommended: Large pattern searches
 
 Aho-Corasick:
@@ -261,6 +270,11 @@ Aho-Corasick:
 • Complexity: O(n + m + z)
 • Recommended: Many keywords at once
 
+Inverted Index:
+• Best for: Large corpus, selective keywords
+• Complexity: O(postings) per keyword
+• Recommended: After running build_index.py
+
 Levenshtein Distance:
 • Best for: Fuzzy matching
 • Complexity: O(n × m)
@@ -292,6 +306,8 @@ Levenshtein Distance:
         
         if reply == QtWidgets.QMessageBox.Yes:
             print("👋 Closing ATS CV Search Application")
+            self.search_controller.close()
+            self.pdf_extractor.close()
             event.accept()
         else:
             event.ignore()
\ No newline at end of file
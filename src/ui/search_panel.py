@@ -1,7 +1,7 @@
 """Search panel for keyword input"""
 
 from PyQt5 import QtWidgets, QtCore
-import re
+from utils.query import QueryError, parse_query
 
 class SearchPanel(QtWidgets.QWidget):
     """Search panel widget"""
@@ -72,7 +72,10 @@ class SearchPanel(QtWidgets.QWidget):
             "Examples:\n"
             "• Python, SQL, Machine Learning\n"
             "• React, JavaScript, Node.js\n"
-            "• Accounting, Excel, Finance"
+            "• Accounting, Excel, Finance\n"
+            "• category:HR AND \"payroll\" NOT intern\n\n"
+            "AND/OR/NOT, quotes or category: switch to query mode,\n"
+            "where ( ) and -word are operators; quote text to keep it literal"
         )
         self.keywords_input.setMaximumHeight(120)
         self.keywords_input.setStyleSheet("""
@@ -113,8 +116,9 @@ class SearchPanel(QtWidgets.QWidget):
         self.algorithm_buttons = {}
         algorithms = [
             ("KMP", "Knuth-Morris-Pratt - General purpose"),
-            ("BM", "Boyer-Moore - Long patterns"),
+            ("BM", "Boyer-Moore (Horspool) - Long patterns"),
             ("AC", "Aho-Corasick - Multiple keywords"),
+            ("INDEX", "Inverted Index - Large corpus"),
             ("LEVENSHTEIN", "Levenshtein - Fuzzy matching")
         ]
         
@@ -165,6 +169,11 @@ class SearchPanel(QtWidgets.QWidget):
         self.fuzzy_threshold_spin.setStyleSheet(self.get_input_style())
         params_layout.addRow("Fuzzy Threshold:", self.fuzzy_threshold_spin)
         
+        # Require every keyword
+        self.match_all_check = QtWidgets.QCheckBox("Match all keywords")
+        self.match_all_check.setStyleSheet("font-size: 13px; padding: 5px 0;")
+        params_layout.addRow(self.match_all_check)
+        
         layout.addWidget(params_group)
     
     def create_search_button(self, layout):
@@ -293,8 +302,13 @@ class SearchPanel(QtWidgets.QWidget):
             self.keywords_validation.show()
             return False
         
-        # Parse keywords
-        keywords = [kw.strip() for kw in re.split(r'[,\n]', text) if kw.strip()]
+        # Parse query
+        try:
+            keywords = parse_query(text).keywords
+        except QueryError as e:
+            self.keywords_validation.setText(f"❌ {e}")
+            self.keywords_validation.show()
+            return False
         
         if len(keywords) == 0:
             self.keywords_validation.setText("❌ Enter at least one keyword")
@@ -315,15 +329,16 @@ class SearchPanel(QtWidgets.QWidget):
             return
         
         # Get keywords
-        text = self.keywords_input.toPlainText().strip()
-        keywords = [kw.strip() for kw in re.split(r'[,\n]', text) if kw.strip()]
+        query = parse_query(self.keywords_input.toPlainText().strip())
         
         # Get parameters
         search_params = {
-            'keywords': keywords,
+            'keywords': query.keywords,
+            'query': query,
             'algorithm': self.get_selected_algorithm(),
             'top_n': self.top_n_spin.value(),
-            'fuzzy_threshold': self.fuzzy_threshold_spin.value()
+            'fuzzy_threshold': self.fuzzy_threshold_spin.value(),
+            'match_all': self.match_all_check.isChecked()
         }
         
         # Emit signal
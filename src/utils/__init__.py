@@ -3,9 +3,9 @@
 This package contains utility functions and classes for the ATS CV Search application.
 """
 
-from .pdf_extractor import PDFExtractor
+from .pdf_extractor import PDFExtractor, get_shared_extractor
 from .regex_extractor import RegexExtractor
 from .timer import SearchTimer
 from .encryption import Encryption
 
-__all__ = ['PDFExtractor', 'RegexExtractor', 'SearchTimer', 'Encryption']
+__all__ = ['PDFExtractor', 'get_shared_extractor', 'RegexExtractor', 'SearchTimer', 'Encryption']
@@ -0,0 +1,93 @@
+"""Size-bounded LRU cache"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+def estimate_size(key: Hashable, value: Any) -> int:
+    """Approximate memory held by a cache entry"""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+class LRUCache:
+    """LRU cache bounded by a byte budget, with hit/miss/eviction counters"""
+    
+    def __init__(self, max_bytes: int, sizeof: Optional[Callable[[Hashable, Any], int]] = None):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or estimate_size
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get value and mark it most recently used"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Hashable, value: Any):
+        """Insert value, evicting least recently used entries over budget"""
+        size = self.sizeof(key, value)
+        
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            
+            # Entry alone exceeds budget, do not cache it
+            if size > self.max_bytes:
+                return
+            
+            self.entries[key] = (value, size)
+            self.current_bytes += size
+            
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def add(self, key: Hashable):
+        """Set-style insert"""
+        self.put(key, True)
+    
+    def discard(self, key: Hashable):
+        """Remove entry if present"""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry[1]
+    
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
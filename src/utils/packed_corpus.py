@@ -0,0 +1,174 @@
+"""Memory-mapped packed corpus of folded CV text
+
+Layout (little endian):
+    header   magic, doc count, version length, version
+    keys     doc count x 40-byte hex content hashes, sorted
+    offsets  (doc count + 1) x uint64 blob offsets
+    blob     lowercased UTF-8 texts, in key order
+
+Opening maps the file read-only and parses only the header, so startup does
+not depend on corpus size and every process mapping the file shares the same
+physical pages.
+"""
+
+import os
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from utils.text_store import get_cache_dir
+
+PACK_MAGIC = b'ATSPACK1'
+HEADER = struct.Struct('<8sIH')
+KEY_SIZE = 40
+OFFSET = struct.Struct('<Q')
+
+def fold_text(text: str) -> bytes:
+    """Lowercased UTF-8 bytes, identical to text.lower().encode('utf-8')"""
+    if text.isascii():
+        # ASCII fold stays in bytes, skipping the Unicode case tables
+        return text.encode('ascii').lower()
+    return text.lower().encode('utf-8')
+
+def get_corpus_path() -> Path:
+    """Get packed corpus file path in the cache directory"""
+    return get_cache_dir() / 'corpus.pack'
+
+def write_packed_corpus(texts: Iterable[Tuple[str, str]], version: str,
+                        path: Optional[Path] = None) -> Tuple[int, int]:
+    """Write (content_hash, text) pairs, returns (doc count, blob bytes)"""
+    path = Path(path) if path else get_corpus_path()
+    folded: Dict[str, bytes] = {
+        content_hash: fold_text(text)
+        for content_hash, text in texts
+        if len(content_hash) == KEY_SIZE
+    }
+    keys = sorted(folded)
+    version_bytes = version.encode('utf-8')
+    
+    offsets = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(folded[key]))
+    
+    # Write beside the target and swap, readers keep their old mapping
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(PACK_MAGIC, len(keys), len(version_bytes)))
+        file.write(version_bytes)
+        file.write(''.join(keys).encode('ascii'))
+        file.write(b''.join(OFFSET.pack(offset) for offset in offsets))
+        for key in keys:
+            file.write(folded[key])
+    os.replace(tmp_path, path)
+    
+    return len(keys), offsets[-1]
+
+class PackedCorpus:
+    """Read-only view of a packed corpus file"""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.file_stat = os.stat(self.path)
+        
+        with open(self.path, 'rb') as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, self.doc_count, version_len = HEADER.unpack_from(self.mm, 0)
+        if magic != PACK_MAGIC:
+            self.mm.close()
+            raise ValueError(f"Not a packed corpus: {self.path}")
+        
+        position = HEADER.size
+        self.version = self.mm[position:position + version_len].decode('utf-8')
+        self.keys_start = position + version_len
+        self.offsets_start = self.keys_start + self.doc_count * KEY_SIZE
+        self.blob_start = self.offsets_start + (self.doc_count + 1) * OFFSET.size
+    
+    def __len__(self) -> int:
+        return self.doc_count
+    
+    def __contains__(self, content_hash: str) -> bool:
+        return self._find(content_hash) >= 0
+    
+    def _find(self, content_hash: Optional[str]) -> int:
+        """Binary search the sorted key table, -1 when absent"""
+        if not content_hash or len(content_hash) != KEY_SIZE:
+            return -1
+        
+        key = content_hash.encode('ascii')
+        low, high = 0, self.doc_count
+        while low < high:
+            middle = (low + high) // 2
+            start = self.keys_start + middle * KEY_SIZE
+            current = self.mm[start:start + KEY_SIZE]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return middle
+        return -1
+    
+    def span(self, content_hash: Optional[str]) -> Optional[Tuple[int, int]]:
+        """Get (start, end) of a document in the mapping"""
+        index = self._find(content_hash)
+        if index < 0:
+            return None
+        
+        start = OFFSET.unpack_from(self.mm, self.offsets_start + index * OFFSET.size)[0]
+        end = OFFSET.unpack_from(self.mm, self.offsets_start + (index + 1) * OFFSET.size)[0]
+        return self.blob_start + start, self.blob_start + end
+    
+    def view(self, content_hash: Optional[str]) -> Optional[memoryview]:
+        """Zero-copy view of a document's folded UTF-8 bytes"""
+        span = self.span(content_hash)
+        if span is None:
+            return None
+        return memoryview(self.mm)[span[0]:span[1]]
+    
+    def text(self, content_hash: Optional[str]) -> Optional[str]:
+        """Decoded folded text of a document"""
+        span = self.span(content_hash)
+        if span is None:
+            return None
+        return self.mm[span[0]:span[1]].decode('utf-8')
+    
+    def contains(self, content_hash: Optional[str], pattern: bytes) -> Optional[bool]:
+        """Substring test inside one document, None when the document is absent"""
+        span = self.span(content_hash)
+        if span is None:
+            return None
+        return self.mm.find(pattern, span[0], span[1]) >= 0
+    
+    def is_stale(self) -> bool:
+        """Check if the file was rewritten since it was mapped"""
+        try:
+            current = os.stat(self.path)
+        except OSError:
+            return True
+        return (current.st_ino, current.st_mtime_ns) != (self.file_stat.st_ino, self.file_stat.st_mtime_ns)
+    
+    def close(self):
+        """Unmap file"""
+        try:
+            self.mm.close()
+        except BufferError:
+            # Views still alive, mapping is released with them
+            pass
+
+def open_packed_corpus(version: str, path: Optional[Path] = None) -> Optional[PackedCorpus]:
+    """Open packed corpus if it exists and matches the extractor version"""
+    path = Path(path) if path else get_corpus_path()
+    if not path.exists():
+        return None
+    
+    try:
+        corpus = PackedCorpus(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    
+    if corpus.version != version:
+        corpus.close()
+        return None
+    return corpus
@@ -0,0 +1,222 @@
+"""Pluggable PDF text backends"""
+
+import io
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, List
+
+class PDFBackend(ABC):
+    """PDF text backend interface"""
+    
+    name = ''
+    
+    def is_available(self) -> bool:
+        """Check backend dependency is installed"""
+        return True
+    
+    @abstractmethod
+    def open(self, full_path: str):
+        """Context manager opening a document, yields an object with __len__ and page_text(i)"""
+
+class PyPDF2Backend(PDFBackend):
+    """PyPDF2 backend (default, pure Python)"""
+    
+    name = 'pypdf2'
+    
+    @contextmanager
+    def open(self, full_path: str):
+        import PyPDF2
+        
+        # Open with binary mode for cross-platform compatibility
+        with open(full_path, 'rb') as file:
+            yield _PyPDF2Document(PyPDF2.PdfReader(file))
+
+class _PyPDF2Document:
+    def __init__(self, reader):
+        self.reader = reader
+    
+    def __len__(self):
+        return len(self.reader.pages)
+    
+    def page_text(self, index: int) -> str:
+        return self.reader.pages[index].extract_text() or ""
+
+class PdfiumBackend(PDFBackend):
+    """pypdfium2 backend (native PDFium, fastest)"""
+    
+    name = 'pdfium'
+    
+    def is_available(self) -> bool:
+        try:
+            import pypdfium2
+            return True
+        except ImportError:
+            return False
+    
+    @contextmanager
+    def open(self, full_path: str):
+        import pypdfium2
+        
+        document = pypdfium2.PdfDocument(full_path)
+        try:
+            yield _PdfiumDocument(document)
+        finally:
+            document.close()
+
+class _PdfiumDocument:
+    def __init__(self, document):
+        self.document = document
+    
+    def __len__(self):
+        return len(self.document)
+    
+    def page_text(self, index: int) -> str:
+        page = self.document[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_range()
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+
+class PdfminerBackend(PDFBackend):
+    """pdfminer.six backend in layout-free mode"""
+    
+    name = 'pdfminer'
+    
+    def is_available(self) -> bool:
+        try:
+            import pdfminer
+            return True
+        except ImportError:
+            return False
+    
+    @contextmanager
+    def open(self, full_path: str):
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        
+        with open(full_path, 'rb') as file:
+            document = PDFDocument(PDFParser(file))
+            yield _PdfminerDocument(list(PDFPage.create_pages(document)))
+
+class _PdfminerDocument:
+    def __init__(self, pages):
+        from pdfminer.pdfinterp import PDFResourceManager
+        
+        self.pages = pages
+        self.resource_manager = PDFResourceManager(caching=True)
+    
+    def __len__(self):
+        return len(self.pages)
+    
+    def page_text(self, index: int) -> str:
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFPageInterpreter
+        
+        # No LAParams: skip layout analysis, text in content-stream order
+        output = io.StringIO()
+        device = TextConverter(self.resource_manager, output, laparams=None)
+        try:
+            PDFPageInterpreter(self.resource_manager, device).process_page(self.pages[index])
+        finally:
+            device.close()
+        return output.getvalue()
+
+BACKENDS: Dict[str, PDFBackend] = {
+    backend.name: backend
+    for backend in (PyPDF2Backend(), PdfiumBackend(), PdfminerBackend())
+}
+
+DEFAULT_BACKEND = 'pypdf2'
+
+def get_backend_name(name: str = None) -> str:
+    """Resolve configured backend name (ATS_PDF_BACKEND), falling back to PyPDF2"""
+    name = (name or os.getenv('ATS_PDF_BACKEND', DEFAULT_BACKEND)).lower()
+    backend = BACKENDS.get(name)
+    
+    if backend is None or not backend.is_available():
+        return DEFAULT_BACKEND
+    return name
+
+def get_backend(name: str = None) -> PDFBackend:
+    """Get backend by name"""
+    return BACKENDS[get_backend_name(name)]
+
+def available_backends() -> List[str]:
+    """Names of installed backends"""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+def compare_backends(max_files: int = 100, max_pages: int = 5):
+    """Compare backends on the bundled data/ corpus against PyPDF2"""
+    import re
+    import time
+    from pathlib import Path
+    
+    project_root = Path(__file__).parent.parent.parent
+    pdf_files = sorted((project_root / 'data').glob('*/*.pdf'))
+    
+    # Spread the sample over all categories
+    step = max(1, len(pdf_files) // max_files)
+    sample = pdf_files[::step][:max_files]
+    
+    def extract(backend: PDFBackend, path: Path) -> str:
+        with backend.open(str(path)) as document:
+            pages = [document.page_text(i) for i in range(min(len(document), max_pages))]
+        return re.sub(r'\s+', ' ', ' '.join(pages)).strip()
+    
+    print("=== PDF BACKEND COMPARISON ===")
+    print(f"Files: {len(sample)} (first {max_pages} pages each)")
+    
+    texts = {}
+    for name in available_backends():
+        backend = BACKENDS[name]
+        texts[name] = {}
+        failures = 0
+        
+        start_time = time.time()
+        for path in sample:
+            try:
+                texts[name][path] = extract(backend, path)
+            except Exception:
+                failures += 1
+                texts[name][path] = ""
+        elapsed = time.time() - start_time
+        
+        chars = sum(len(text) for text in texts[name].values())
+        print(f"{name:>9}: {elapsed:7.2f}s  {chars / elapsed:>10,.0f} chars/s  "
+              f"{len(sample) / elapsed:6.1f} files/s  {failures} failed")
+    
+    # Text equivalence against the default backend
+    print("\nEquivalence vs PyPDF2 (exact = identical cleaned text, no-space = identical "
+          "ignoring whitespace, token overlap = Jaccard on lowercase words):")
+    reference = texts[DEFAULT_BACKEND]
+    for name, backend_texts in texts.items():
+        if name == DEFAULT_BACKEND:
+            continue
+        
+        exact = 0
+        no_space = 0
+        overlaps = []
+        for path in sample:
+            if backend_texts[path] == reference[path]:
+                exact += 1
+            if backend_texts[path].replace(' ', '') == reference[path].replace(' ', ''):
+                no_space += 1
+            words_a = set(re.findall(r'\w+', reference[path].lower()))
+            words_b = set(re.findall(r'\w+', backend_texts[path].lower()))
+            union = words_a | words_b
+            overlaps.append(len(words_a & words_b) / len(union) if union else 1.0)
+        
+        print(f"{name:>9}: exact {exact}/{len(sample)}, no-space {no_space}/{len(sample)}, "
+              f"token overlap mean {sum(overlaps) / len(overlaps):.3f}, min {min(overlaps):.3f}")
+
+if __name__ == "__main__":
+    import sys
+    
+    max_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    compare_backends(max_files=max_files)
@@ -1,22 +1,75 @@
 """PDF text extraction utility"""
 
-import PyPDF2
 import os
+import hashlib
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Dict, Tuple, Iterator, Callable
 import logging
 import time
+from utils.text_store import TextStore
+from utils.lru_cache import LRUCache
+from utils.pdf_backends import get_backend, get_backend_name
+
+# Single text budget shared by extraction, cleaning and matching
+MAX_TEXT_CHARS = 10000
+
+# Bump when extraction output changes so stored texts are re-extracted
+EXTRACTION_VERSION = 'pypdf2-2'
+
+# Worker deadlines and crashes depend on machine load, these files are retried next session
+TRANSIENT_ERRORS = ('Timed out', 'Worker crashed')
+
+class ExtractionError(Exception):
+    """Raised when a PDF cannot be extracted"""
+
+_shared_extractor = None
+_shared_lock = threading.Lock()
+
+def get_shared_extractor() -> 'PDFExtractor':
+    """Process-wide extractor shared by controllers and UI"""
+    global _shared_extractor
+    
+    with _shared_lock:
+        if _shared_extractor is None:
+            # Isolated extraction bounds search latency on malformed PDFs
+            _shared_extractor = PDFExtractor(isolated=True)
+        return _shared_extractor
 
 class PDFExtractor:
     """PDF text extractor with cross-platform support"""
     
-    def __init__(self):
+    def __init__(self, text_store: Optional[TextStore] = None, isolated: bool = False,
+                 cache_budget_mb: float = 32, backend: Optional[str] = None):
         self.project_root = Path(__file__).parent.parent.parent
         self.max_file_size_mb = 10
         self.max_pages = 5
         self.max_extraction_time = 10
-        self.text_cache = {}
-        self.failed_files = set()
+        self.max_text_chars = MAX_TEXT_CHARS
+        
+        # Text backend from argument or ATS_PDF_BACKEND
+        self.backend_name = get_backend_name(backend)
+        
+        # Byte-bounded caches keep RSS predictable in long sessions
+        self.text_cache = LRUCache(int(cache_budget_mb * 1024 * 1024))
+        self.failed_files = LRUCache(1024 * 1024)
+        # Identical PDFs share one text, cached and stored by content hash
+        self.path_hashes = LRUCache(1024 * 1024)
+        if text_store is None:
+            # Texts from different backends are stored separately
+            text_store = TextStore(version=f"{EXTRACTION_VERSION}:{self.backend_name}")
+        self.text_store = text_store
+        # Older stores recorded transient failures as permanent
+        self.text_store.clear_failures(TRANSIENT_ERRORS)
+        
+        # Isolated mode parses in killable worker processes
+        self.isolated = isolated
+        self.hard_timeout = 20
+        self._idle_workers = queue.Queue()
+        self._all_workers = []
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -27,8 +80,8 @@ class PDFExtractor:
         
         if pdf_text and len(pdf_text.strip()) > 10:
             text = pdf_text.lower()
-            if len(text) > 10000:
-                text = text[:10000]
+            if len(text) > self.max_text_chars:
+                text = text[:self.max_text_chars]
             return text
         
         return self._generate_searchable_content(cv_path)
@@ -44,76 +97,305 @@ class PDFExtractor:
             
             self.logger.debug(f"Extracting from: {full_path}")
             
-            # Check cache and failed files
-            cache_key = str(full_path)
-            if cache_key in self.failed_files:
-                return None
-            
-            if cache_key in self.text_cache:
-                return self.text_cache[cache_key]
-            
-            # Check file size
-            try:
-                file_size_mb = os.path.getsize(full_path) / (1024 * 1024)
-                if file_size_mb > self.max_file_size_mb:
-                    self.logger.warning(f"File too large: {file_size_mb:.1f}MB")
-                    self.failed_files.add(cache_key)
-                    return None
-            except:
-                self.failed_files.add(cache_key)
-                return None
-
-            start_time = time.time()
+            # Check caches, file size and persistent store
+            cached, job = self._prepare_extraction(full_path)
+            if job is None:
+                return cached
             
-            # Open with binary mode for cross-platform compatibility
-            with open(full_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                # Check page count
-                num_pages = len(pdf_reader.pages)
-                if num_pages > 20:
-                    self.logger.warning(f"Too many pages: {num_pages}")
-                    self.failed_files.add(cache_key)
-                    return None
-                
-                text = ""
-                max_pages = min(num_pages, self.max_pages)
-                
-                for i in range(max_pages):
-                    # Check timeout
-                    if time.time() - start_time > self.max_extraction_time:
-                        self.logger.warning(f"Timeout: {full_path}")
-                        break
-                    
-                    try:
-                        page = pdf_reader.pages[i]
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                        
-                        if len(text) > 5000:
-                            break
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Page {i} error: {e}")
-                        continue
-                
-                # Clean and cache
-                if text.strip():
-                    cleaned_text = self._clean_text(text)
-                    self.text_cache[cache_key] = cleaned_text
-                    self.logger.info(f"Extracted {len(cleaned_text)} chars")
-                    return cleaned_text
-                else:
-                    self.logger.warning(f"No text extracted")
-                    self.failed_files.add(cache_key)
-                    return None
+            text, error = self._parse(full_path)
+            return self._finish_extraction(*job, text, error)
                 
         except Exception as e:
             self.logger.error(f"Error reading PDF: {e}")
             self.failed_files.add(cv_path)
             return None
     
+    def peek_text(self, cv_path: str) -> Optional[str]:
+        """Get text from memory cache or persistent store without parsing the PDF"""
+        full_path = self._resolve_path(cv_path)
+        if not full_path:
+            return None
+        
+        cached, _ = self._prepare_extraction(full_path)
+        return cached
+    
+    def iter_text_chunks(self, cv_path: str) -> Iterator[str]:
+        """Yield cleaned page chunks lazily; text is cached once fully consumed"""
+        full_path = self._resolve_path(cv_path)
+        if not full_path:
+            self.logger.warning(f"File not found: {cv_path}")
+            return
+        
+        cached, job = self._prepare_extraction(full_path)
+        if job is None:
+            if cached:
+                yield cached
+            return
+        
+        chunks = []
+        try:
+            for chunk in self._stream(full_path):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            self._finish_extraction(*job, None, str(e))
+            return
+        
+        # Stream finished without early exit, cache the full text
+        self._finish_extraction(*job, ' '.join(chunks), None)
+    
+    def contains_all_keywords(self, cv_path: str, keywords: List[str],
+                              contains: Optional[Callable[[str, str], bool]] = None) -> bool:
+        """Check that every keyword occurs, stopping at the page where the last one is found"""
+        contains = contains or (lambda text, keyword: keyword in text)
+        remaining = {keyword.lower() for keyword in keywords if keyword.strip()}
+        if not remaining:
+            return True
+        
+        # Carry a tail so keywords spanning two pages are still found
+        overlap = max(len(keyword) for keyword in remaining) - 1
+        tail = ""
+        
+        chunks = self.iter_text_chunks(cv_path)
+        try:
+            for chunk in chunks:
+                window = (tail + " " + chunk.lower()) if tail else chunk.lower()
+                remaining = {keyword for keyword in remaining if not contains(window, keyword)}
+                if not remaining:
+                    return True
+                tail = window[-overlap:] if overlap > 0 else ""
+        finally:
+            chunks.close()
+        
+        return False
+    
+    def content_hash(self, cv_path: str) -> Optional[str]:
+        """Get SHA-1 of the PDF bytes, None if the file is unreadable"""
+        full_path = self._resolve_path(cv_path)
+        if not full_path:
+            return None
+        
+        cache_key = self._store_key(full_path)
+        content_hash = self.path_hashes.get(cache_key)
+        if content_hash is not None:
+            return content_hash
+        
+        try:
+            return self._hash_content(cache_key, full_path, os.stat(full_path))
+        except OSError:
+            return None
+    
+    def file_signature(self, cv_path: str) -> Optional[Tuple[int, int]]:
+        """Get (mtime_ns, size) of a CV file without reading it, None if missing"""
+        full_path = self._resolve_path(cv_path)
+        if not full_path:
+            return None
+        
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def extract_many(self, cv_paths: List[str], workers: Optional[int] = None,
+                     progress_callback=None) -> Dict[str, Optional[str]]:
+        """Extract, clean and cache text for many CVs using worker processes"""
+        results = {}
+        pending = []
+        duplicates = {}
+        
+        for cv_path in cv_paths:
+            full_path = self._resolve_path(cv_path)
+            if not full_path:
+                self.logger.warning(f"File not found: {cv_path}")
+                results[cv_path] = None
+                continue
+            
+            cached, job = self._prepare_extraction(full_path)
+            if job is None:
+                results[cv_path] = cached
+            elif job[2] in duplicates:
+                # Same content already queued, parse it once
+                duplicates[job[2]].append((cv_path, job))
+            else:
+                duplicates[job[2]] = []
+                pending.append((cv_path, full_path, job))
+        
+        if not pending:
+            return results
+        
+        self._extract_pending(pending, results, workers, progress_callback)
+        
+        # Fan text out to files sharing the content
+        for cv_path, _, job in pending:
+            text = results[cv_path]
+            for duplicate_path, duplicate_job in duplicates[job[2]]:
+                if text is None:
+                    self.failed_files.add(duplicate_job[0])
+                results[duplicate_path] = text
+        
+        return results
+    
+    def _extract_pending(self, pending: list, results: Dict[str, Optional[str]],
+                         workers: Optional[int], progress_callback):
+        """Parse pending (cv_path, full_path, job) entries into results"""
+        total = len(pending)
+        workers = min(workers or os.cpu_count() or 1, total)
+        
+        if workers <= 1:
+            # Not worth a pool, extract one by one
+            for done, (cv_path, full_path, job) in enumerate(pending, 1):
+                text, error = self._parse(full_path)
+                results[cv_path] = self._finish_extraction(*job, text, error)
+                self._report_progress(progress_callback, done, total)
+            return
+        
+        if self.isolated:
+            # Each thread drives one killable worker process
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(self._parse, full_path): (cv_path, job)
+                    for cv_path, full_path, job in pending
+                }
+                
+                for done, future in enumerate(as_completed(futures), 1):
+                    cv_path, job = futures[future]
+                    text, error = future.result()
+                    results[cv_path] = self._finish_extraction(*job, text, error)
+                    self._report_progress(progress_callback, done, total)
+            
+            return
+        
+        # Spawn keeps workers independent of GUI threads on every platform
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(_extract_pdf_worker, *self._parse_args(full_path)): (cv_path, job)
+                for cv_path, full_path, job in pending
+            }
+            
+            for done, future in enumerate(as_completed(futures), 1):
+                cv_path, job = futures[future]
+                try:
+                    text, error = future.result()
+                except Exception as e:
+                    text, error = None, f"Worker crashed: {e}"
+                results[cv_path] = self._finish_extraction(*job, text, error)
+                self._report_progress(progress_callback, done, total)
+    
+    def _prepare_extraction(self, full_path: Path):
+        """Check caches before parsing, returns (text, None) or (None, job)"""
+        # Canonical key so every spelling of a path shares one entry
+        cache_key = self._store_key(full_path)
+        if cache_key in self.failed_files:
+            return None, None
+        
+        content_hash = self.path_hashes.get(cache_key)
+        if content_hash is not None:
+            cached_text = self.text_cache.get(content_hash)
+            if cached_text is not None:
+                return cached_text, None
+        
+        # Check file size
+        try:
+            file_stat = os.stat(full_path)
+            file_size_mb = file_stat.st_size / (1024 * 1024)
+            if file_size_mb > self.max_file_size_mb:
+                self.logger.warning(f"File too large: {file_size_mb:.1f}MB")
+                self.failed_files.add(cache_key)
+                return None, None
+            
+            if content_hash is None:
+                content_hash = self._hash_content(cache_key, full_path, file_stat)
+                cached_text = self.text_cache.get(content_hash)
+                if cached_text is not None:
+                    return cached_text, None
+        except:
+            self.failed_files.add(cache_key)
+            return None, None
+        
+        # Check persistent store before parsing
+        stored_text = self.text_store.get(content_hash)
+        if stored_text is not None:
+            self.text_cache.put(content_hash, stored_text)
+            return stored_text, None
+        
+        # Skip files that already failed in this version
+        if self.text_store.get_failure(cache_key, file_stat):
+            self.failed_files.add(cache_key)
+            return None, None
+        
+        return None, (cache_key, file_stat, content_hash)
+    
+    def _hash_content(self, cache_key: str, full_path: Path, file_stat: os.stat_result) -> str:
+        """Get content hash from the store, hashing the file when it changed"""
+        content_hash = self.text_store.get_hash(cache_key, file_stat)
+        if content_hash is None:
+            content_hash = _hash_file(str(full_path))
+            self.text_store.put_hash(cache_key, file_stat, content_hash)
+        
+        self.path_hashes.put(cache_key, content_hash)
+        return content_hash
+    
+    def _parse_args(self, full_path: Path) -> tuple:
+        """Arguments for the module-level parse functions"""
+        return (str(full_path), self.max_pages, self.max_extraction_time, self.max_text_chars,
+                self.backend_name)
+    
+    def _parse(self, full_path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Parse PDF in process, or in an isolated worker with a hard deadline"""
+        if not self.isolated:
+            return _extract_pdf_worker(*self._parse_args(full_path))
+        
+        worker = self._checkout_worker()
+        try:
+            return worker.run(self._parse_args(full_path), self.hard_timeout)
+        finally:
+            self._idle_workers.put(worker)
+    
+    def _stream(self, full_path: Path) -> Iterator[str]:
+        """Stream cleaned page chunks, isolated mode keeps the hard deadline"""
+        if not self.isolated:
+            yield from _iter_pdf_chunks(*self._parse_args(full_path))
+            return
+        
+        worker = self._checkout_worker()
+        try:
+            yield from worker.stream(self._parse_args(full_path), self.hard_timeout)
+        finally:
+            self._idle_workers.put(worker)
+    
+    def _checkout_worker(self) -> '_IsolatedWorker':
+        """Take an idle isolated worker or start a new one"""
+        try:
+            return self._idle_workers.get_nowait()
+        except queue.Empty:
+            worker = _IsolatedWorker()
+            self._all_workers.append(worker)
+            return worker
+    
+    def _finish_extraction(self, cache_key: str, file_stat: os.stat_result, content_hash: str,
+                           text: Optional[str], error: Optional[str]) -> Optional[str]:
+        """Cache extraction result or record failure, transient failures stay in memory"""
+        if text:
+            self.text_cache.put(content_hash, text)
+            self.text_store.put(content_hash, text)
+            self.logger.info(f"Extracted {len(text)} chars")
+            return text
+        
+        error = error or "No text extracted"
+        self.logger.warning(f"{error}: {cache_key}")
+        self.failed_files.add(cache_key)
+        if not error.startswith(TRANSIENT_ERRORS):
+            self.text_store.put_failure(cache_key, file_stat, error)
+        return None
+    
+    def _report_progress(self, progress_callback, done: int, total: int):
+        """Report extraction progress"""
+        if progress_callback:
+            progress = done / total * 100
+            progress_callback(f"Extracting: {done}/{total} ({progress:.0f}%)")
+    
     def _resolve_path(self, cv_path: str) -> Optional[Path]:
         """Resolve file path with cross-platform support"""
         # Convert to Path object
@@ -139,7 +421,15 @@ class PDFExtractor:
         
         return None
     
-    def _clean_text(self, text: str) -> str:
+    def _store_key(self, full_path: Path) -> str:
+        """Get store key, relative to project root when possible"""
+        try:
+            return full_path.resolve().relative_to(self.project_root.resolve()).as_posix()
+        except ValueError:
+            return full_path.resolve().as_posix()
+    
+    @staticmethod
+    def _clean_text(text: str) -> str:
         """Clean extracted text"""
         if not text:
             return ""
@@ -150,8 +440,8 @@ class PDFExtractor:
         text = re.sub(r'\s+', ' ', text)
         text = text.strip()
         
-        if len(text) > 15000:
-            text = text[:15000]
+        if len(text) > MAX_TEXT_CHARS:
+            text = text[:MAX_TEXT_CHARS]
         
         return text
     
@@ -244,11 +534,200 @@ Experience in {category.replace('-', ' ').lower()} field
         """Get extraction statistics"""
         return {
             'cached_files': len(self.text_cache),
+            'hashed_files': len(self.path_hashes),
             'failed_files': len(self.failed_files),
-            'total_processed': len(self.text_cache) + len(self.failed_files)
+            'total_processed': len(self.text_cache) + len(self.failed_files),
+            'cache_bytes': self.text_cache.current_bytes,
+            'cache_budget_bytes': self.text_cache.max_bytes,
+            'cache_hits': self.text_cache.hits,
+            'cache_misses': self.text_cache.misses,
+            'cache_evictions': self.text_cache.evictions,
+            'store_hits': self.text_store.hits,
+            'store_misses': self.text_store.misses,
+            'persistent_failures': self.text_store.failure_count(),
+            'backend': self.backend_name
         }
     
     def clear_cache(self):
-        """Clear text cache"""
+        """Clear in-memory text cache (persistent store is kept)"""
         self.text_cache.clear()
-        self.failed_files.clear()
\ No newline at end of file
+        self.failed_files.clear()
+        self.path_hashes.clear()
+    
+    def close(self):
+        """Stop isolated worker processes"""
+        for worker in self._all_workers:
+            worker.stop()
+        self._all_workers.clear()
+        self._idle_workers = queue.Queue()
+
+def _hash_file(full_path: str) -> str:
+    """SHA-1 of file bytes"""
+    digest = hashlib.sha1()
+    with open(full_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _iter_pdf_chunks(full_path: str, max_pages: int, max_extraction_time: float,
+                     max_chars: int, backend_name: str) -> Iterator[str]:
+    """Yield cleaned page chunks until the page, time or character budget is spent"""
+    logger = logging.getLogger(__name__)
+    start_time = time.time()
+    
+    with get_backend(backend_name).open(full_path) as document:
+        # Check page count
+        num_pages = len(document)
+        if num_pages > 20:
+            raise ExtractionError(f"Too many pages ({num_pages})")
+        
+        remaining = max_chars
+        for i in range(min(num_pages, max_pages)):
+            # Check timeout
+            if time.time() - start_time > max_extraction_time:
+                logger.warning(f"Timeout: {full_path}")
+                break
+            
+            try:
+                page_text = document.page_text(i)
+            except Exception as e:
+                logger.warning(f"Page {i} error: {e}")
+                continue
+            
+            chunk = PDFExtractor._clean_text(page_text)[:remaining]
+            if not chunk:
+                continue
+            
+            yield chunk
+            
+            # Chunks are joined with a single space
+            remaining -= len(chunk) + 1
+            if remaining <= 0:
+                break
+
+def _extract_pdf_worker(full_path: str, max_pages: int, max_extraction_time: float,
+                        max_chars: int, backend_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Parse and clean PDF text, returns (text, error); runs in worker processes"""
+    try:
+        text = ' '.join(_iter_pdf_chunks(full_path, max_pages, max_extraction_time, max_chars,
+                                         backend_name))
+    except ExtractionError as e:
+        return None, str(e)
+    except Exception as e:
+        return None, f"Error reading PDF: {e}"
+    
+    if not text:
+        return None, "No text extracted"
+    
+    return text, None
+
+def _isolated_worker_loop(conn):
+    """Serve extraction jobs until the pipe closes"""
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        
+        if job is None:
+            break
+        
+        mode, args = job
+        if mode == 'extract':
+            conn.send(_extract_pdf_worker(*args))
+            continue
+        
+        # Stream mode: send a chunk, wait for the parent to ask for more
+        try:
+            for chunk in _iter_pdf_chunks(*args):
+                conn.send(('chunk', chunk))
+                if not conn.recv():
+                    break
+            conn.send(('end', None))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+class _IsolatedWorker:
+    """Long-lived extraction process that is killed when it misses a deadline"""
+    
+    def __init__(self):
+        self.context = multiprocessing.get_context('spawn')
+        self.process = None
+        self.conn = None
+    
+    def _start(self):
+        """Start worker process"""
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=_isolated_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+    
+    def _receive(self, deadline: float, hard_timeout: float):
+        """Receive next message before deadline or kill the worker"""
+        remaining = deadline - time.time()
+        try:
+            if remaining > 0 and self.conn.poll(remaining):
+                return self.conn.recv()
+        except (EOFError, OSError) as e:
+            self.stop()
+            raise ExtractionError(f"Worker crashed: {e}")
+        
+        # Deadline missed, kill the stuck parse
+        self.stop()
+        raise ExtractionError(f"Timed out after {hard_timeout}s")
+    
+    def run(self, args: tuple, hard_timeout: float) -> Tuple[Optional[str], Optional[str]]:
+        """Run one extraction, returns (text, error)"""
+        if self.process is None or not self.process.is_alive():
+            self._start()
+        
+        try:
+            self.conn.send(('extract', args))
+            return self._receive(time.time() + hard_timeout, hard_timeout)
+        except ExtractionError as e:
+            return None, str(e)
+        except OSError as e:
+            self.stop()
+            return None, f"Worker crashed: {e}"
+    
+    def stream(self, args: tuple, hard_timeout: float) -> Iterator[str]:
+        """Stream page chunks, the whole stream shares one deadline"""
+        if self.process is None or not self.process.is_alive():
+            self._start()
+        
+        deadline = time.time() + hard_timeout
+        self.conn.send(('stream', args))
+        
+        finished = False
+        try:
+            while True:
+                kind, payload = self._receive(deadline, hard_timeout)
+                if kind == 'end':
+                    finished = True
+                    return
+                if kind == 'error':
+                    finished = True
+                    raise ExtractionError(payload)
+                
+                yield payload
+                self.conn.send(True)
+        finally:
+            if not finished and self.conn is not None:
+                # Consumer stopped early, let the worker close the file
+                try:
+                    self.conn.send(False)
+                    while self._receive(deadline, hard_timeout)[0] == 'chunk':
+                        pass
+                except (ExtractionError, OSError):
+                    self.stop()
+    
+    def stop(self):
+        """Kill worker process"""
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.process = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
\ No newline at end of file
@@ -0,0 +1,406 @@
+"""Boolean and phrase query language for keyword search
+
+Grammar (operators are upper case, everything else is matched as text):
+
+    query   := or_expr
+    or_expr := and_expr (('OR' | ',' | newline) and_expr)*
+    and_expr:= not_expr (['AND'] not_expr)*
+    not_expr:= 'NOT' not_expr | '-' primary | primary
+    primary := '(' or_expr ')' | '"phrase"' | field ':' value | words
+
+Text without an upper case operator, a double quote or a field filter is not
+parsed: it stays the old comma (or newline) separated keyword list, so
+parentheses and a leading '-' in plain keywords are matched literally. In a
+query, quote text to match it literally, e.g. "Sales (B2B)" or "-ish".
+Adjacent bare words form one keyword.
+"""
+
+import re
+from typing import Callable, List, Optional
+
+FIELDS = ('category', 'name', 'id')
+OPERATORS = ('AND', 'OR', 'NOT')
+
+TOKEN_RE = re.compile(r'''[ \t\r\f\v]*(?:
+    (?P<lparen>\() |
+    (?P<rparen>\)) |
+    (?P<sep>[,\n]) |
+    "(?P<phrase>[^"]*)" |
+    (?P<field>[A-Za-z_]+):(?:"(?P<quoted_value>[^"]*)"|(?P<value>[^\s,()"]+)) |
+    (?P<word>[^\s,()"]+)
+)''', re.VERBOSE)
+
+# Any of these switches plain keyword input to the query language
+QUERY_SYNTAX_RE = re.compile(
+    r'(?<![^\s,(])(?:AND|OR|NOT)(?![^\s,)])|"|(?<![\w-])(?i:' + '|'.join(FIELDS) + r'):'
+)
+
+# Selectivity when nothing better is known, keeps the written order
+UNKNOWN_SELECTIVITY = 0.5
+
+class QueryError(ValueError):
+    """Raised for queries that cannot be parsed"""
+
+class Term:
+    """Keyword or phrase that must occur in the CV text"""
+    
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+    
+    def evaluate(self, resume, contains: Callable[[str], bool]) -> bool:
+        """Does the clause hold for this resume"""
+        return contains(self.keyword)
+    
+    def estimate(self, selectivity: Callable[[str], float]) -> float:
+        """Estimated fraction of CVs the clause holds for"""
+        return selectivity(self.keyword)
+    
+    def cost(self) -> int:
+        """0 when the clause needs no CV text"""
+        return 1
+    
+    def __str__(self) -> str:
+        return f'"{self.keyword}"'
+
+class FieldFilter:
+    """Case-insensitive equality on a resume attribute, needs no text"""
+    
+    def __init__(self, field: str, value: str):
+        self.field = field
+        self.value = value.lower()
+    
+    def evaluate(self, resume, contains: Callable[[str], bool]) -> bool:
+        return str(getattr(resume, self.field, '') or '').lower() == self.value
+    
+    def estimate(self, selectivity: Callable[[str], float]) -> float:
+        return UNKNOWN_SELECTIVITY
+    
+    def cost(self) -> int:
+        return 0
+    
+    def __str__(self) -> str:
+        return f'{self.field}:"{self.value}"'
+
+class Not:
+    """Negated clause"""
+    
+    def __init__(self, child):
+        self.child = child
+    
+    def evaluate(self, resume, contains: Callable[[str], bool]) -> bool:
+        return not self.child.evaluate(resume, contains)
+    
+    def estimate(self, selectivity: Callable[[str], float]) -> float:
+        return 1.0 - self.child.estimate(selectivity)
+    
+    def cost(self) -> int:
+        return self.child.cost()
+    
+    def __str__(self) -> str:
+        return f'NOT {self.child}'
+
+class And:
+    """All clauses must hold, most selective clause first"""
+    
+    def __init__(self, children: List):
+        self.children = children
+    
+    def evaluate(self, resume, contains: Callable[[str], bool]) -> bool:
+        return all(child.evaluate(resume, contains) for child in self.children)
+    
+    def estimate(self, selectivity: Callable[[str], float]) -> float:
+        return min(child.estimate(selectivity) for child in self.children)
+    
+    def cost(self) -> int:
+        return max(child.cost() for child in self.children)
+    
+    def order(self, selectivity: Callable[[str], float]):
+        # Free field filters first, then the clause most likely to fail
+        self.children.sort(key=lambda child: (child.cost(), child.estimate(selectivity)))
+    
+    def __str__(self) -> str:
+        return '(' + ' AND '.join(str(child) for child in self.children) + ')'
+
+class Or:
+    """Any clause must hold, most likely clause first"""
+    
+    def __init__(self, children: List):
+        self.children = children
+    
+    def evaluate(self, resume, contains: Callable[[str], bool]) -> bool:
+        return any(child.evaluate(resume, contains) for child in self.children)
+    
+    def estimate(self, selectivity: Callable[[str], float]) -> float:
+        return min(1.0, sum(child.estimate(selectivity) for child in self.children))
+    
+    def cost(self) -> int:
+        return max(child.cost() for child in self.children)
+    
+    def order(self, selectivity: Callable[[str], float]):
+        # Free field filters first, then the clause most likely to succeed
+        self.children.sort(key=lambda child: (child.cost(), -child.estimate(selectivity)))
+    
+    def __str__(self) -> str:
+        return '(' + ' OR '.join(str(child) for child in self.children) + ')'
+
+class QueryPlan:
+    """Parsed query: a boolean filter plus the keywords used for ranking"""
+    
+    def __init__(self, root, text: str = ''):
+        self.root = root
+        self.text = text
+    
+    def _walk(self, node=None, negated: bool = False):
+        """Yield (node, negated) for every node"""
+        node = node or self.root
+        yield node, negated
+        if isinstance(node, Not):
+            yield from self._walk(node.child, not negated)
+        elif isinstance(node, (And, Or)):
+            for child in node.children:
+                yield from self._walk(child, negated)
+    
+    @property
+    def keywords(self) -> List[str]:
+        """Non-negated keywords in query order, used for counting and ranking"""
+        keywords = []
+        for node, negated in self._walk():
+            if isinstance(node, Term) and not negated and node.keyword not in keywords:
+                keywords.append(node.keyword)
+        return keywords
+    
+    @property
+    def terms(self) -> List[str]:
+        """Every keyword the filter may test, negated ones included"""
+        terms = []
+        for node, _ in self._walk():
+            if isinstance(node, Term) and node.keyword not in terms:
+                terms.append(node.keyword)
+        return terms
+    
+    @property
+    def is_simple(self) -> bool:
+        """True for a plain keyword list, which needs no filter pass"""
+        if isinstance(self.root, Term):
+            return True
+        return isinstance(self.root, Or) and all(isinstance(child, Term) for child in self.root.children)
+    
+    def required_categories(self) -> List[str]:
+        """Categories every match must have, for SQL pushdown (empty when unrestricted)"""
+        clauses = self.root.children if isinstance(self.root, And) else [self.root]
+        for clause in clauses:
+            if isinstance(clause, FieldFilter) and clause.field == 'category':
+                return [clause.value]
+        return []
+    
+    def optimize(self, selectivity: Callable[[str], float]) -> 'QueryPlan':
+        """Reorder clauses so evaluation short-circuits as early as possible"""
+        # Children first so composite estimates see their final order
+        for node, _ in reversed(list(self._walk())):
+            if isinstance(node, (And, Or)):
+                node.order(selectivity)
+        return self
+    
+    def matches(self, resume, contains: Callable[[str], bool]) -> bool:
+        """Evaluate the filter for one resume, contains(keyword) tests its text"""
+        return self.root.evaluate(resume, contains)
+    
+    def __str__(self) -> str:
+        return str(self.root)
+
+class _Parser:
+    """Recursive descent parser over query tokens"""
+    
+    def __init__(self, text: str):
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+    
+    @staticmethod
+    def _tokenize(text: str) -> List[tuple]:
+        tokens = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            match = TOKEN_RE.match(text, pos)
+            if not match or match.end() == pos:
+                raise QueryError(f"Unexpected character at {pos}: {text[pos:pos + 10]!r}")
+            pos = match.end()
+            kind = match.lastgroup
+            if kind in ('quoted_value', 'value'):
+                field = match.group('field').lower()
+                if field not in FIELDS:
+                    # Not a field filter (e.g. "http:..."), match it as text
+                    tokens.append(('word', match.group(0).strip()))
+                    continue
+                tokens.append(('field', (field, match.group(kind))))
+            elif kind == 'word' and match.group('word') in OPERATORS:
+                tokens.append((match.group('word'), None))
+            elif kind == 'word' and match.group('word').startswith('-') and len(match.group('word')) > 1:
+                tokens.append(('NOT', None))
+                tokens.append(('word', match.group('word')[1:]))
+            else:
+                tokens.append((kind, match.group(kind)))
+        return tokens
+    
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+    
+    def take(self) -> tuple:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+    
+    def expect_operand(self, operator: str):
+        """Raise for an operator with nothing after it, e.g. 'python OR'"""
+        if self.peek() in (None, 'rparen', 'sep', 'OR', 'AND'):
+            raise QueryError(f"{operator} needs a keyword after it")
+    
+    def parse(self):
+        # Leading, trailing and repeated separators are ignored like the old split
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QueryError(f"Unexpected {self.tokens[self.pos][1] or self.peek()!r}")
+        if node is None:
+            raise QueryError("Query is empty")
+        return node
+    
+    def parse_or(self):
+        children = []
+        while True:
+            while self.peek() == 'sep':
+                self.take()
+            if self.peek() in (None, 'rparen'):
+                break
+            children.append(self.parse_and())
+            if self.peek() == 'OR':
+                self.take()
+                self.expect_operand('OR')
+            elif self.peek() != 'sep':
+                break
+        
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else Or(children)
+    
+    def parse_and(self):
+        children = [self.parse_not()]
+        while True:
+            if self.peek() == 'AND':
+                self.take()
+                self.expect_operand('AND')
+            elif self.peek() not in ('NOT', 'lparen', 'phrase', 'field', 'word'):
+                break
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+    
+    def parse_not(self):
+        if self.peek() == 'NOT':
+            self.take()
+            self.expect_operand('NOT')
+            return Not(self.parse_not())
+        return self.parse_primary()
+    
+    def parse_primary(self):
+        kind = self.peek()
+        if kind == 'lparen':
+            self.take()
+            node = self.parse_or()
+            if self.peek() != 'rparen':
+                raise QueryError("Missing closing parenthesis")
+            self.take()
+            if node is None:
+                raise QueryError("Empty parentheses")
+            return node
+        if kind == 'phrase':
+            phrase = self.take()[1]
+            if not phrase.strip():
+                raise QueryError("Empty phrase")
+            return Term(phrase)
+        if kind == 'field':
+            return FieldFilter(*self.take()[1])
+        if kind == 'word':
+            # Adjacent bare words form one keyword
+            words = [self.take()[1]]
+            while self.peek() == 'word':
+                words.append(self.take()[1])
+            return Term(' '.join(words))
+        
+        raise QueryError(f"Expected a keyword, got {kind or 'end of query'}")
+
+def is_query_syntax(text: str) -> bool:
+    """True when text uses operators, quotes or field filters"""
+    return QUERY_SYNTAX_RE.search(text) is not None
+
+def parse_query(text: str) -> QueryPlan:
+    """Parse query text into a plan, raises QueryError"""
+    if is_query_syntax(text):
+        return QueryPlan(_Parser(text).parse(), text)
+    
+    # Plain comma separated keywords, split exactly as before the query language
+    terms = [Term(keyword.strip()) for keyword in re.split(r'[,\n]', text) if keyword.strip()]
+    if not terms:
+        raise QueryError("Query is empty")
+    return QueryPlan(terms[0] if len(terms) == 1 else Or(terms), text)
+
+def test_parse_query():
+    """Parser against plain lists, precedence, NOT, field filters and errors"""
+    print("🧪 Testing query parser...")
+    
+    # Plain input keeps its literal meaning
+    cases = {
+        'Python, SQL, Machine Learning': ['Python', 'SQL', 'Machine Learning'],
+        'Sales (B2B)': ['Sales (B2B)'],
+        '-ish, C++': ['-ish', 'C++'],
+        'python or java\nnot excel': ['python or java', 'not excel'],
+        'Python,,  SQL ,': ['Python', 'SQL'],
+    }
+    for text, keywords in cases.items():
+        plan = parse_query(text)
+        assert plan.is_simple and plan.keywords == keywords, (text, plan.keywords)
+    print("   ✅ plain keyword lists split on commas and newlines only")
+    
+    # AND binds tighter than OR, adjacency is AND
+    cases = {
+        'a OR b AND c': '("a" OR ("b" AND "c"))',
+        'a b OR c': '("a b" OR "c")',
+        '(a OR b) AND c': '(("a" OR "b") AND "c")',
+        '"a" "b" OR c': '(("a" AND "b") OR "c")',
+        'a, b AND c': '("a" OR ("b" AND "c"))',
+        '"Sales (B2B)" AND python': '("Sales (B2B)" AND "python")',
+    }
+    for text, expected in cases.items():
+        assert str(parse_query(text)) == expected, (text, str(parse_query(text)))
+    print("   ✅ precedence and grouping")
+    
+    # NOT and -word negate, negated keywords are filtered but not ranked
+    plan = parse_query('python AND NOT java -excel "-ish"')
+    assert str(plan) == '("python" AND NOT "java" AND NOT "excel" AND "-ish")', str(plan)
+    assert plan.keywords == ['python', '-ish'] and plan.terms == ['python', 'java', 'excel', '-ish']
+    assert parse_query('NOT NOT a').matches(None, lambda keyword: True)
+    print("   ✅ NOT, -word and quoted literals")
+    
+    # Field filters need no text and push categories down
+    class Resume:
+        category = 'HR'
+        name = 'Ana'
+        id = 7
+    plan = parse_query('category:hr AND payroll')
+    assert plan.required_categories() == ['hr']
+    assert plan.matches(Resume(), lambda keyword: keyword == 'payroll')
+    assert not parse_query('Category:"Human Resources" payroll').matches(Resume(), lambda keyword: True)
+    assert parse_query('id:7 OR name:bob').matches(Resume(), lambda keyword: False)
+    assert parse_query('"x" http://a.b').keywords == ['x', 'http://a.b']
+    print("   ✅ field filters")
+    
+    # Dangling operators and broken syntax are errors, not dropped
+    for text in ('python OR', 'OR python', 'python AND', 'python AND OR java', 'NOT', 'a OR, b',
+                 '(python AND java', 'python AND java)', '() AND a', '"" AND a', ' , ', 'a AND ()'):
+        try:
+            parse_query(text)
+        except QueryError:
+            continue
+        raise AssertionError(f"{text!r} should not parse")
+    print("   ✅ dangling operators, unbalanced parentheses and empty queries raise QueryError")
+
+if __name__ == "__main__":
+    test_parse_query()
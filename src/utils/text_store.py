@@ -0,0 +1,288 @@
+"""Persistent store for extracted CV text"""
+
+import os
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+def get_cache_dir() -> Path:
+    """Get cache directory (override with ATS_CACHE_DIR)"""
+    project_root = Path(__file__).parent.parent.parent
+    return Path(os.getenv('ATS_CACHE_DIR', str(project_root / 'cache')))
+
+class TextStore:
+    """SQLite-backed text and failure store; texts are keyed by content hash and extractor version"""
+    
+    def __init__(self, db_path: Optional[str] = None, version: str = ''):
+        self.db_path = Path(db_path) if db_path else get_cache_dir() / 'text_store.db'
+        self.version = version
+        self.lock = threading.Lock()
+        self.conn = None
+        self.hits = 0
+        self.misses = 0
+        
+        self.logger = logging.getLogger(__name__)
+        self._open()
+    
+    def _open(self):
+        """Open database and create schema"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self._drop_path_keyed_text()
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS file_hash (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    hashed_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS file_hash_content ON file_hash (content_hash)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS extracted_text (
+                    content_hash TEXT PRIMARY KEY,
+                    version TEXT NOT NULL DEFAULT '',
+                    text TEXT NOT NULL,
+                    extracted_at REAL NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS failed_extraction (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    version TEXT NOT NULL DEFAULT '',
+                    reason TEXT NOT NULL,
+                    failed_at REAL NOT NULL
+                )
+            """)
+            self._add_version_columns()
+            self.conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            # Store is an optimization, run without it
+            self.logger.warning(f"Text store disabled: {e}")
+            self.conn = None
+    
+    def _drop_path_keyed_text(self):
+        """Drop text table of stores created before content hashing, texts are re-extracted"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(extracted_text)")]
+        if 'path' in columns:
+            self.conn.execute("DROP TABLE extracted_text")
+    
+    def _add_version_columns(self):
+        """Add version column to stores created before it existed"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(failed_extraction)")]
+        if 'version' not in columns:
+            self.conn.execute("ALTER TABLE failed_extraction ADD COLUMN version TEXT NOT NULL DEFAULT ''")
+    
+    @property
+    def enabled(self) -> bool:
+        return self.conn is not None
+    
+    def get_hash(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """Get stored content hash if the file is unchanged"""
+        if not self.conn:
+            return None
+        
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT content_hash FROM file_hash WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size)
+            ).fetchone()
+            return row[0] if row else None
+    
+    def put_hash(self, path: str, stat: os.stat_result, content_hash: str):
+        """Store content hash for file"""
+        if not self.conn:
+            return
+        
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO file_hash (path, mtime_ns, size, content_hash, hashed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, content_hash, time.time())
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Text store write failed: {e}")
+    
+    def get(self, content_hash: str) -> Optional[str]:
+        """Get stored text for content hash"""
+        if not self.conn:
+            return None
+        
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT version, text FROM extracted_text WHERE content_hash = ?",
+                (content_hash,)
+            ).fetchone()
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            version, text = row
+            if version != self.version:
+                # Extractor changed since extraction, drop stale entry
+                self.conn.execute("DELETE FROM extracted_text WHERE content_hash = ?", (content_hash,))
+                self.conn.commit()
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            return text
+    
+    def iter_texts(self) -> List[Tuple[str, str]]:
+        """Get all (content_hash, text) stored by the current extractor version"""
+        if not self.conn:
+            return []
+        
+        with self.lock:
+            return self.conn.execute(
+                "SELECT content_hash, text FROM extracted_text WHERE version = ?",
+                (self.version,)
+            ).fetchall()
+    
+    def is_fresh(self, path: str, stat: os.stat_result) -> bool:
+        """Check if stored text exists for the current file version"""
+        if not self.conn:
+            return False
+        
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM file_hash f JOIN extracted_text t ON t.content_hash = f.content_hash "
+                "WHERE f.path = ? AND f.mtime_ns = ? AND f.size = ? AND t.version = ?",
+                (path, stat.st_mtime_ns, stat.st_size, self.version)
+            ).fetchone()
+            return row is not None
+    
+    def put(self, content_hash: str, text: str):
+        """Store extracted text once per content hash"""
+        if not self.conn:
+            return
+        
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO extracted_text (content_hash, version, text, extracted_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (content_hash, self.version, text, time.time())
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Text store write failed: {e}")
+    
+    def get_failure(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """Get recorded failure reason if the file is unchanged"""
+        if not self.conn:
+            return None
+        
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT reason FROM failed_extraction WHERE path = ? AND mtime_ns = ? AND size = ? AND version = ?",
+                (path, stat.st_mtime_ns, stat.st_size, self.version)
+            ).fetchone()
+            return row[0] if row else None
+    
+    def put_failure(self, path: str, stat: os.stat_result, reason: str):
+        """Record failed extraction with reason"""
+        if not self.conn:
+            return
+        
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO failed_extraction (path, mtime_ns, size, version, reason, failed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, self.version, reason, time.time())
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Text store write failed: {e}")
+    
+    def get_failures(self) -> List[Tuple[str, str]]:
+        """Get all recorded failures as (path, reason)"""
+        if not self.conn:
+            return []
+        
+        with self.lock:
+            return self.conn.execute(
+                "SELECT path, reason FROM failed_extraction ORDER BY path"
+            ).fetchall()
+    
+    def failure_count(self) -> int:
+        """Count recorded failures"""
+        if not self.conn:
+            return 0
+        
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM failed_extraction").fetchone()[0]
+    
+    def clear_failures(self, reasons: Optional[Tuple[str, ...]] = None):
+        """Forget recorded failures so files are retried, only reasons with these prefixes if given"""
+        if not self.conn:
+            return
+        
+        with self.lock:
+            if reasons is None:
+                self.conn.execute("DELETE FROM failed_extraction")
+            else:
+                for reason in reasons:
+                    self.conn.execute("DELETE FROM failed_extraction WHERE reason LIKE ? || '%'", (reason,))
+            self.conn.commit()
+    
+    def remove(self, path: str):
+        """Remove stored text for file"""
+        if not self.conn:
+            return
+        
+        with self.lock:
+            self.conn.execute("DELETE FROM file_hash WHERE path = ?", (path,))
+            self.conn.execute("DELETE FROM failed_extraction WHERE path = ?", (path,))
+            # Drop text no other file shares
+            self.conn.execute(
+                "DELETE FROM extracted_text WHERE content_hash NOT IN (SELECT content_hash FROM file_hash)"
+            )
+            self.conn.commit()
+    
+    def count(self) -> int:
+        """Count stored texts (one per unique content)"""
+        if not self.conn:
+            return 0
+        
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM extracted_text").fetchone()[0]
+    
+    def file_count(self) -> int:
+        """Count hashed files"""
+        if not self.conn:
+            return 0
+        
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM file_hash").fetchone()[0]
+    
+    def clear(self):
+        """Remove all stored entries"""
+        if not self.conn:
+            return
+        
+        with self.lock:
+            self.conn.execute("DELETE FROM file_hash")
+            self.conn.execute("DELETE FROM extracted_text")
+            self.conn.execute("DELETE FROM failed_extraction")
+            self.conn.commit()
+    
+    def close(self):
+        """Close database connection"""
+        if self.conn:
+            with self.lock:
+                self.conn.close()
+                self.conn = None
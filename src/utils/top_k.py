@@ -0,0 +1,63 @@
+"""Bounded top-K selection"""
+
+import heapq
+from typing import Any, List, Optional, Tuple
+
+class TopK:
+    """Keeps the k best (key, item) pairs in a min-heap, earlier order wins ties
+    
+    k=None keeps everything, which makes the selector a plain sorted collector.
+    """
+    
+    def __init__(self, k: Optional[int]):
+        self.k = k
+        self.heap: List[Tuple[Any, int, Any]] = []
+        self.next_order = 0
+    
+    def __len__(self) -> int:
+        return len(self.heap)
+    
+    def is_full(self) -> bool:
+        """True once k items are kept"""
+        return self.k is not None and len(self.heap) >= self.k
+    
+    def threshold(self) -> Optional[Any]:
+        """Key an item must beat to get in, None while not full"""
+        return self.heap[0][0] if self.is_full() and self.heap else None
+    
+    def can_skip(self, bound: Any) -> bool:
+        """True if nothing with key <= bound can enter any more"""
+        if self.k == 0:
+            return True
+        
+        threshold = self.threshold()
+        return threshold is not None and bound < threshold
+    
+    def accepts(self, key: Any, order: Optional[int] = None) -> bool:
+        """Would an item with this key (and order) be kept"""
+        if not self.is_full():
+            return True
+        if not self.heap:
+            return False
+        order = self.next_order if order is None else order
+        return (key, -order) > self.heap[0][:2]
+    
+    def push(self, key: Any, item: Any, order: Optional[int] = None) -> bool:
+        """Offer an item, returns True if it was kept"""
+        if order is None:
+            order = self.next_order
+        self.next_order = max(self.next_order, order + 1)
+        
+        if not self.accepts(key, order):
+            return False
+        
+        entry = (key, -order, item)
+        if self.is_full():
+            heapq.heapreplace(self.heap, entry)
+        else:
+            heapq.heappush(self.heap, entry)
+        return True
+    
+    def items(self) -> List[Any]:
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self.heap, key=lambda entry: entry[:2], reverse=True)]